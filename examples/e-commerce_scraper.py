@@ -7,14 +7,24 @@ and monitor prices over time.
 """
 
 import os
+import re
 import sys
 import logging
+import queue
 import time
 import json
 import datetime
-from typing import Dict, List, Any
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -31,6 +41,56 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Price parsing helpers, built once rather than on every call
+_PRICE_RE = re.compile(r"\d+\.\d+|\d+")
+_CURRENCY_TABLE = str.maketrans("", "", "$€£,")
+
+# Directories already created by _ensure_dir
+_ENSURED_DIRS = set()
+
+def clean_price(price_str: str) -> float:
+    """
+    Clean a price string and convert it to a float.
+    
+    Args:
+        price_str (str): The price string to clean.
+    
+    Returns:
+        float: The cleaned price as a float.
+    """
+    # Remove currency symbols and commas, then extract the first number found
+    match = _PRICE_RE.search(price_str.translate(_CURRENCY_TABLE))
+    if match:
+        return float(match.group(0))
+    
+    return 0.0
+
+def clean_prices(price_strs: List[Optional[str]]) -> List[Optional[float]]:
+    """
+    Clean a batch of price strings and convert them to floats.
+    
+    Used as a batch processor, so the engine calls it once with every price
+    matched on a page instead of once per element.
+    
+    Args:
+        price_strs (List[Optional[str]]): The price strings to clean, None where
+                                          the value is missing.
+    
+    Returns:
+        List[Optional[float]]: The cleaned prices, 0.0 where no number was found
+                               and None where the value is missing.
+    """
+    search = _PRICE_RE.search
+    table = _CURRENCY_TABLE
+    prices = []
+    for price_str in price_strs:
+        if price_str is None:
+            prices.append(None)
+            continue
+        match = search(price_str.translate(table))
+        prices.append(float(match.group(0)) if match else 0.0)
+    return prices
+
 # Define product URLs to monitor
 PRODUCTS = [
     {
@@ -40,7 +100,7 @@ PRODUCTS = [
             "title": "h1.product-title",
             "price": {
                 "selector": "span.price",
-                "processors": [lambda x: float(x.replace("$", "").replace(",", ""))]
+                "processors_batch": [clean_prices]
             },
             "availability": "span.availability",
             "rating": {
@@ -66,63 +126,104 @@ PRODUCTS = [
     # Add more products here
 ]
 
-def clean_price(price_str: str) -> float:
+def _ensure_dir(file_path: str) -> None:
     """
-    Clean a price string and convert it to a float.
+    Ensure the directory of a file exists, creating it at most once per process.
     
     Args:
-        price_str (str): The price string to clean.
-    
-    Returns:
-        float: The cleaned price as a float.
+        file_path (str): The path to the file.
     """
-    # Remove currency symbols and commas
-    cleaned = price_str.replace("$", "").replace("€", "").replace("£", "").replace(",", "")
-    
-    # Extract the first number found
-    import re
-    match = re.search(r"(\d+\.\d+|\d+)", cleaned)
-    if match:
-        return float(match.group(1))
-    
-    return 0.0
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
 
 def load_price_history(file_path: str) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Load price history from a file.
+    Load price history from a JSON Lines file.
+    
+    Each line holds one price record tagged with its product name.
     
     Args:
         file_path (str): The path to the price history file.
     
     Returns:
-        Dict[str, List[Dict[str, Any]]]: The price history.
+        Dict[str, List[Dict[str, Any]]]: The price history, grouped by product.
     """
+    price_history = defaultdict(list)
+    
     if not os.path.exists(file_path):
-        return {}
+        return price_history
+    
+    loads = orjson.loads if orjson else json.loads
     
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                
+                try:
+                    record = loads(line)
+                except ValueError:
+                    # Skip a partially written line, e.g. from an interrupted run
+                    logger.warning("Skipping malformed price history record")
+                    continue
+                
+                price_history[record.pop("product")].append(record)
     except Exception as e:
-        logger.error(f"Error loading price history: {str(e)}")
-        return {}
+        logger.error("Error loading price history: %s", e)
+    
+    return price_history
 
-def save_price_history(price_history: Dict[str, List[Dict[str, Any]]], file_path: str) -> None:
+def save_price_history(entries: List[Dict[str, Any]], file_path: str) -> None:
     """
-    Save price history to a file.
+    Append new price records to a JSON Lines file.
     
     Args:
-        price_history (Dict[str, List[Dict[str, Any]]]): The price history.
-        file_path (str): The path to save the price history file.
+        entries (List[Dict[str, Any]]): The new price records, each with a "product" key.
+        file_path (str): The path to the price history file.
     """
+    if not entries:
+        return
+    
     # Ensure directory exists
-    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    _ensure_dir(file_path)
+    
+    # Serialize the new records in one go and append them with a single call
+    if orjson:
+        payload = b"".join(orjson.dumps(entry) + b"\n" for entry in entries)
+    else:
+        payload = "".join(json.dumps(entry) + "\n" for entry in entries).encode('utf-8')
     
     try:
-        with open(file_path, 'w') as f:
-            json.dump(price_history, f, indent=2)
+        with open(file_path, 'ab', buffering=1 << 20) as f:
+            f.write(payload)
     except Exception as e:
-        logger.error(f"Error saving price history: {str(e)}")
+        logger.error("Error saving price history: %s", e)
+
+def scrape_domain_products(scraper: Scraper, products: List[Dict[str, Any]], results: queue.Queue) -> None:
+    """
+    Scrape the products of a single domain one after another.
+    
+    Products of the same domain are scraped serially so the scraper's request
+    delay still applies to that site; different domains run in parallel.
+    
+    Args:
+        scraper (Scraper): The scraper to use.
+        products (List[Dict[str, Any]]): The products hosted on the domain.
+        results (queue.Queue): Queue receiving (product, data) pairs.
+    """
+    for product in products:
+        logger.info("Scraping product: %s", product['name'])
+        
+        try:
+            data = scraper.scrape(product["url"], product["selector_schema"])
+        except Exception as e:
+            logger.error("Error scraping %s: %s", product['name'], e)
+            continue
+        
+        results.put((product, data))
 
 def monitor_prices():
     """Monitor product prices and track changes over time."""
@@ -139,74 +240,87 @@ def monitor_prices():
     scraper = Scraper(config=config)
     
     # Load existing price history
-    price_history_file = "data/price_history.json"
+    price_history_file = "data/price_history.jsonl"
     price_history = load_price_history(price_history_file)
+    new_entries = []
+    
+    # Latest known record per product, seeded from the stored history and
+    # updated as products are scraped
+    latest_by_product = {
+        product_name: history[-1]
+        for product_name, history in price_history.items() if history
+    }
     
     # Current timestamp
     timestamp = datetime.datetime.now().isoformat()
     
-    # Scrape each product
+    # Group products by domain so independent sites are scraped concurrently
+    products_by_domain = defaultdict(list)
     for product in PRODUCTS:
+        # Compile each selector schema once up front
+        product = dict(product, selector_schema=scraper.compile_schema(product["selector_schema"]))
+        products_by_domain[urlsplit(product["url"]).netloc].append(product)
+    
+    results = queue.Queue()
+    max_workers = max(1, min(len(products_by_domain), 16))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for products in products_by_domain.values():
+            executor.submit(scrape_domain_products, scraper, products, results)
+    
+    # Process the scraped products on the main thread
+    product_rows = []
+    while not results.empty():
+        product, data = results.get_nowait()
         product_name = product["name"]
         product_url = product["url"]
-        selector_schema = product["selector_schema"]
-        
-        logger.info(f"Scraping product: {product_name}")
         
         try:
-            # Scrape the product page
-            data = scraper.scrape(product_url, selector_schema)
-            
             # Add timestamp and URL
             data["timestamp"] = timestamp
             data["url"] = product_url
             
-            # Initialize price history for this product if it doesn't exist
-            if product_name not in price_history:
-                price_history[product_name] = []
-            
-            # Add the current price to the history
-            price_history[product_name].append({
-                "timestamp": timestamp,
+            # Record the current price
+            entry = {
                 "price": data.get("price"),
-                "availability": data.get("availability")
-            })
+                "availability": data.get("availability"),
+                "timestamp": timestamp
+            }
+            previous = latest_by_product.get(product_name)
+            latest_by_product[product_name] = entry
+            new_entries.append({"product": product_name, **entry})
             
             # Check for price changes
-            if len(price_history[product_name]) > 1:
-                current_price = data.get("price")
-                previous_price = price_history[product_name][-2]["price"]
+            if previous is not None:
+                current_price = entry["price"]
+                previous_price = previous["price"]
                 
-                if current_price != previous_price:
+                # Only compute and format the change report if it will be logged
+                if current_price != previous_price and logger.isEnabledFor(logging.INFO):
                     price_diff = current_price - previous_price
                     percent_change = (price_diff / previous_price) * 100 if previous_price else 0
                     
-                    logger.info(f"Price change detected for {product_name}:")
-                    logger.info(f"  Previous price: ${previous_price:.2f}")
-                    logger.info(f"  Current price: ${current_price:.2f}")
-                    logger.info(f"  Difference: ${price_diff:.2f} ({percent_change:.2f}%)")
+                    logger.info("Price change detected for %s:", product_name)
+                    logger.info("  Previous price: $%.2f", previous_price)
+                    logger.info("  Current price: $%.2f", current_price)
+                    logger.info("  Difference: $%.2f (%.2f%%)", price_diff, percent_change)
             
-            # Export the current product data
-            product_file = f"data/{product_name.lower().replace(' ', '_')}.json"
-            scraper.export(data, product_file)
+            product_rows.append(data)
             
         except Exception as e:
-            logger.error(f"Error scraping {product_name}: {str(e)}")
+            logger.error("Error processing %s: %s", product_name, e)
+    
+    # Export the current product data in one pass
+    if product_rows:
+        scraper.export(product_rows, "data/products.csv")
     
-    # Save the updated price history
-    save_price_history(price_history, price_history_file)
+    # Append this run's prices to the history
+    save_price_history(new_entries, price_history_file)
     
     # Export a summary of the current prices
-    summary = []
-    for product_name, history in price_history.items():
-        if history:
-            latest = history[-1]
-            summary.append({
-                "product": product_name,
-                "price": latest["price"],
-                "availability": latest["availability"],
-                "timestamp": latest["timestamp"]
-            })
+    summary = [
+        {"product": product_name, **entry}
+        for product_name, entry in latest_by_product.items()
+    ]
     
     scraper.export(summary, "data/price_summary.json")
     scraper.export(summary, "data/price_summary.csv")
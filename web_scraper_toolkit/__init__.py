@@ -7,12 +7,14 @@ __author__ = "Web Scraper Toolkit Team"
 
 from .scraper import Scraper
 from .config import ScraperConfig
+from .engines import CompiledSchema
 from .scheduler.job import ScraperJob
 from .scheduler.scheduler import JobScheduler
 
 __all__ = [
     "Scraper",
     "ScraperConfig",
+    "CompiledSchema",
     "ScraperJob",
     "JobScheduler",
 ]
\ No newline at end of file
@@ -4,8 +4,9 @@ Configuration handling for the Web Scraper Toolkit.
 
 import os
 import logging
+import importlib.util
 from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -13,7 +14,84 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+def _parse_bool(value: str) -> bool:
+    """
+    Parse a boolean from an environment variable value.
+    
+    Args:
+        value (str): The environment variable value.
+    
+    Returns:
+        bool: True for "true", "1" or "yes" (case-insensitive), False otherwise.
+    """
+    return value.lower() in ("true", "1", "yes")
+
+# Only advertise brotli when a decoder is installed; requests/urllib3 and aiohttp
+# decode br transparently in that case but would return raw bytes otherwise
+if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+    _ACCEPT_ENCODING = "gzip, br"
+else:
+    _ACCEPT_ENCODING = "gzip"
+
+# Default request headers (besides User-Agent), shared by all configurations
+_DEFAULT_HEADERS = (
+    ("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"),
+    ("Accept-Language", "en-US,en;q=0.5"),
+    ("Accept-Encoding", _ACCEPT_ENCODING),
+    ("Connection", "keep-alive"),
+    ("Upgrade-Insecure-Requests", "1"),
+    ("Cache-Control", "max-age=0"),
+)
+
+# Environment variables that override configuration attributes:
+# (environment variable, attribute, converter)
+_ENV_OVERRIDES = (
+    # Engine settings
+    ("ENGINE", "engine", str),
+    
+    # Browser settings
+    ("BROWSER", "browser", str),
+    ("HEADLESS", "headless", _parse_bool),
+    
+    # User agent settings
+    ("USER_AGENT", "user_agent", str),
+    ("USER_AGENT_ROTATION", "user_agent_rotation", _parse_bool),
+    ("USER_AGENT_LIST_PATH", "user_agent_list_path", str),
+    
+    # Proxy settings
+    ("USE_PROXIES", "use_proxies", _parse_bool),
+    ("PROXY_ROTATION_POLICY", "proxy_rotation_policy", str),
+    ("PROXY_LIST_PATH", "proxy_list_path", str),
+    
+    # Rate limiting
+    ("RESPECT_ROBOTS_TXT", "respect_robots_txt", _parse_bool),
+    ("REQUEST_DELAY", "request_delay", float),
+    ("MAX_REQUESTS_PER_MINUTE", "max_requests_per_minute", int),
+    ("MAX_CONCURRENCY", "max_concurrency", int),
+    ("PER_HOST_CONCURRENCY", "per_host_concurrency", int),
+    ("MAX_WORKERS", "max_workers", int),
+    
+    # Request settings
+    ("MAX_RETRIES", "max_retries", int),
+    ("TIMEOUT", "timeout", int),
+    ("VERIFY_SSL", "verify_ssl", _parse_bool),
+    ("TRUST_ENV", "trust_env", _parse_bool),
+    ("POOL_CONNECTIONS", "pool_connections", int),
+    ("POOL_MAXSIZE", "pool_maxsize", int),
+    ("DNS_CACHE_TTL", "dns_cache_ttl", int),
+    ("HTML_PARSER", "html_parser", str),
+    
+    # Captcha settings
+    ("SOLVE_CAPTCHAS", "solve_captchas", _parse_bool),
+    ("CAPTCHA_SERVICE", "captcha_service", str),
+    ("CAPTCHA_API_KEY", "captcha_api_key", str),
+    
+    # General settings
+    ("LOG_LEVEL", "log_level", str),
+    ("DATA_DIR", "data_dir", str),
+)
+
+@dataclass(slots=True)
 class ScraperConfig:
     """
     Configuration for the scraper.
@@ -28,13 +106,25 @@ class ScraperConfig:
         user_agent (str): The user agent to use for requests.
         user_agent_rotation (bool): Whether to rotate user agents.
         use_proxies (bool): Whether to use proxies.
-        proxy_rotation_policy (str): The policy for rotating proxies.
+        proxy_rotation_policy (str): The policy for rotating proxies ("round-robin", "random" or "weighted").
         respect_robots_txt (bool): Whether to respect robots.txt.
-        request_delay (float): Delay between requests in seconds.
+        request_delay (float): Minimum delay between the starts of requests to the same host, in seconds.
         max_requests_per_minute (int): Maximum number of requests per minute.
+        max_concurrency (int): Maximum number of concurrent requests when scraping multiple URLs.
+        per_host_concurrency (int): Maximum number of concurrent requests to a single host
+                                    (0 for no per-host limit).
+        max_workers (int): Maximum number of threads used to scrape multiple URLs with
+                           engines that do not fetch concurrently themselves.
         max_retries (int): Maximum number of retries for failed requests.
         timeout (int): Request timeout in seconds.
         verify_ssl (bool): Whether to verify SSL certificates.
+        trust_env (bool): Whether to use proxy settings and credentials from environment
+                          variables and .netrc (requests engine).
+        pool_connections (int): Number of per-host connection pools to cache.
+        pool_maxsize (int): Maximum number of connections to keep per host pool.
+        dns_cache_ttl (int): Seconds to cache resolved host names for concurrent scrapes.
+        html_parser (str): The parser used to extract data: "lxml" or "selectolax"
+                           (requires the selectolax package).
         cookies (Dict[str, str]): Cookies to include in requests.
         headers (Dict[str, str]): Headers to include in requests.
         solve_captchas (bool): Whether to solve captchas.
@@ -65,11 +155,19 @@ class ScraperConfig:
     respect_robots_txt: bool = True
     request_delay: float = 2.0
     max_requests_per_minute: int = 30
+    max_concurrency: int = 30
+    per_host_concurrency: int = 0
+    max_workers: int = 8
     
     # Request settings
     max_retries: int = 3
     timeout: int = 30
     verify_ssl: bool = True
+    trust_env: bool = False
+    pool_connections: int = 10
+    pool_maxsize: int = 30
+    dns_cache_ttl: int = 300
+    html_parser: str = "lxml"
     cookies: Dict[str, str] = field(default_factory=dict)
     headers: Dict[str, str] = field(default_factory=dict)
     
@@ -89,77 +187,20 @@ class ScraperConfig:
         # Override settings from environment variables
         self._load_from_env()
         
-        # Set default headers if not provided
+        # Set default headers if not provided. Each configuration gets its own
+        # dict since callers may modify config.headers in place.
         if not self.headers:
-            self.headers = {
-                "User-Agent": self.user_agent,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Cache-Control": "max-age=0",
-            }
+            self.headers = {"User-Agent": self.user_agent}
+            self.headers.update(_DEFAULT_HEADERS)
     
     def _load_from_env(self):
         """
         Load configuration from environment variables.
         """
-        # Engine settings
-        if os.getenv("ENGINE"):
-            self.engine = os.getenv("ENGINE")
-        
-        # Browser settings
-        if os.getenv("BROWSER"):
-            self.browser = os.getenv("BROWSER")
-        if os.getenv("HEADLESS"):
-            self.headless = os.getenv("HEADLESS").lower() in ("true", "1", "yes")
-        
-        # User agent settings
-        if os.getenv("USER_AGENT"):
-            self.user_agent = os.getenv("USER_AGENT")
-        if os.getenv("USER_AGENT_ROTATION"):
-            self.user_agent_rotation = os.getenv("USER_AGENT_ROTATION").lower() in ("true", "1", "yes")
-        if os.getenv("USER_AGENT_LIST_PATH"):
-            self.user_agent_list_path = os.getenv("USER_AGENT_LIST_PATH")
-        
-        # Proxy settings
-        if os.getenv("USE_PROXIES"):
-            self.use_proxies = os.getenv("USE_PROXIES").lower() in ("true", "1", "yes")
-        if os.getenv("PROXY_ROTATION_POLICY"):
-            self.proxy_rotation_policy = os.getenv("PROXY_ROTATION_POLICY")
-        if os.getenv("PROXY_LIST_PATH"):
-            self.proxy_list_path = os.getenv("PROXY_LIST_PATH")
-        
-        # Rate limiting
-        if os.getenv("RESPECT_ROBOTS_TXT"):
-            self.respect_robots_txt = os.getenv("RESPECT_ROBOTS_TXT").lower() in ("true", "1", "yes")
-        if os.getenv("REQUEST_DELAY"):
-            self.request_delay = float(os.getenv("REQUEST_DELAY"))
-        if os.getenv("MAX_REQUESTS_PER_MINUTE"):
-            self.max_requests_per_minute = int(os.getenv("MAX_REQUESTS_PER_MINUTE"))
-        
-        # Request settings
-        if os.getenv("MAX_RETRIES"):
-            self.max_retries = int(os.getenv("MAX_RETRIES"))
-        if os.getenv("TIMEOUT"):
-            self.timeout = int(os.getenv("TIMEOUT"))
-        if os.getenv("VERIFY_SSL"):
-            self.verify_ssl = os.getenv("VERIFY_SSL").lower() in ("true", "1", "yes")
-        
-        # Captcha settings
-        if os.getenv("SOLVE_CAPTCHAS"):
-            self.solve_captchas = os.getenv("SOLVE_CAPTCHAS").lower() in ("true", "1", "yes")
-        if os.getenv("CAPTCHA_SERVICE"):
-            self.captcha_service = os.getenv("CAPTCHA_SERVICE")
-        if os.getenv("CAPTCHA_API_KEY"):
-            self.captcha_api_key = os.getenv("CAPTCHA_API_KEY")
-        
-        # General settings
-        if os.getenv("LOG_LEVEL"):
-            self.log_level = os.getenv("LOG_LEVEL")
-        if os.getenv("DATA_DIR"):
-            self.data_dir = os.getenv("DATA_DIR")
+        for env_key, attr, converter in _ENV_OVERRIDES:
+            value = os.environ.get(env_key)
+            if value:
+                setattr(self, attr, converter(value))
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -168,30 +209,7 @@ class ScraperConfig:
         Returns:
             Dict[str, Any]: The configuration as a dictionary.
         """
-        return {
-            "engine": self.engine,
-            "browser": self.browser,
-            "headless": self.headless,
-            "user_agent": self.user_agent,
-            "user_agent_rotation": self.user_agent_rotation,
-            "user_agent_list_path": self.user_agent_list_path,
-            "use_proxies": self.use_proxies,
-            "proxy_rotation_policy": self.proxy_rotation_policy,
-            "proxy_list_path": self.proxy_list_path,
-            "respect_robots_txt": self.respect_robots_txt,
-            "request_delay": self.request_delay,
-            "max_requests_per_minute": self.max_requests_per_minute,
-            "max_retries": self.max_retries,
-            "timeout": self.timeout,
-            "verify_ssl": self.verify_ssl,
-            "cookies": self.cookies,
-            "headers": self.headers,
-            "solve_captchas": self.solve_captchas,
-            "captcha_service": self.captcha_service,
-            "captcha_api_key": self.captcha_api_key,
-            "log_level": self.log_level,
-            "data_dir": self.data_dir,
-        }
+        return asdict(self)
     
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'ScraperConfig':
@@ -253,4 +271,4 @@ class ScraperConfig:
             else:
                 raise ValueError(f"Unsupported file extension: {ext}")
         
-        logger.info(f"Configuration saved to {file_path}")
\ No newline at end of file
+        logger.info("Configuration saved to %s", file_path)
\ No newline at end of file
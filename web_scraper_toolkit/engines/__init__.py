@@ -3,19 +3,116 @@ Scraping engines for the Web Scraper Toolkit.
 """
 
 import logging
-from typing import Dict, Any, Optional, Type
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import methodcaller
+from typing import Callable, Dict, List, Any, Optional, Tuple, Type, Union
 
+import soupsieve
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, SelectolaxError
+except ImportError:
+    LexborHTMLParser = None
+
+from .fastpath import compile_prefilter
 from ..config import ScraperConfig
 
 logger = logging.getLogger(__name__)
 
+# Translates CSS selectors to XPath expressions for lxml
+_css_translator = HTMLTranslator()
+
+@lru_cache(maxsize=512)
+def _compile_css(selector: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector with soupsieve, shared by all engines.
+    
+    Args:
+        selector (str): The CSS selector.
+    
+    Returns:
+        soupsieve.SoupSieve: The compiled selector.
+    """
+    return soupsieve.compile(selector)
+
+@lru_cache(maxsize=512)
+def _compile_css_xpath(selector: str) -> etree.XPath:
+    """
+    Compile a CSS selector to an lxml XPath expression, shared by all engines.
+    
+    Args:
+        selector (str): The CSS selector.
+    
+    Returns:
+        etree.XPath: The compiled XPath expression.
+    
+    Raises:
+        cssselect.SelectorError: If the selector cannot be translated to XPath.
+    """
+    return etree.XPath(_css_translator.css_to_xpath(selector))
+
+@lru_cache(maxsize=512)
+def _compile_css_selectolax(selector: str) -> methodcaller:
+    """
+    Check that selectolax supports a CSS selector and build its select callable.
+    
+    Args:
+        selector (str): The CSS selector.
+    
+    Returns:
+        methodcaller: Calls css(selector) on a parsed selectolax document.
+    
+    Raises:
+        SelectolaxError: If selectolax cannot parse the selector.
+    """
+    # selectolax only parses a selector when it is used, so try it on an empty document
+    LexborHTMLParser("").css(selector)
+    return methodcaller("css", selector)
+
+@dataclass(frozen=True, eq=False)
+class CompiledSchema:
+    """
+    A schema precompiled into a sequence of extraction operations.
+    
+    Compile a schema once with Scraper.compile_schema() (or
+    BaseEngine.compile_schema()) and pass it to scrape() in place of the
+    schema dict to skip the schema walk and selector compilation per page.
+    
+    Attributes:
+        schema (Dict[str, Any]): The original schema.
+        backend (str): The parser the selectors were compiled for ("lxml", "bs4"
+                       or "selectolax").
+        fields (Tuple[tuple, ...]): (field_name, select, simple, attribute, multiple,
+                                    processors, batch_processors) tuples, where select
+                                    is a callable returning the matching elements of a
+                                    parsed document.
+        prefilter (Optional[Callable[[str], bool]]): Returns False for raw HTML that none of
+                                                    the selectors can match, so parsing can be
+                                                    skipped; None if the selectors are not
+                                                    simple enough to check.
+    """
+    schema: Dict[str, Any]
+    backend: str
+    fields: Tuple[tuple, ...]
+    prefilter: Optional[Callable[[str], bool]] = None
+
+
 class BaseEngine:
     """
     Base class for all scraping engines.
     
     This class defines the interface that all scraping engines must implement.
+    
+    Attributes:
+        thread_safe (bool): Whether scrape() may be called from several threads at
+                            once, letting the scraper use a thread pool.
     """
     
+    thread_safe = False
+    
     def __init__(self, config: ScraperConfig):
         """
         Initialize the engine with the specified configuration.
@@ -24,20 +121,151 @@ class BaseEngine:
             config (ScraperConfig): Configuration for the engine.
         """
         self.config = config
+        
+        # Compiled schema plans, reused across pages
+        self._compiled_schemas: Dict[int, CompiledSchema] = {}
+        
+        self._use_selectolax = config.html_parser == "selectolax"
+        if self._use_selectolax and LexborHTMLParser is None:
+            logger.warning("selectolax is not installed, using lxml to parse HTML")
+            self._use_selectolax = False
+    
+    def _compile(self, selector: str) -> soupsieve.SoupSieve:
+        """
+        Compile a CSS selector, reusing a previously compiled one if available.
+        
+        Args:
+            selector (str): The CSS selector.
+        
+        Returns:
+            soupsieve.SoupSieve: The compiled selector.
+        """
+        return _compile_css(selector)
+    
+    def _compile_xpath(self, selector: str) -> etree.XPath:
+        """
+        Compile a CSS selector to an lxml XPath, reusing a previous one if available.
+        
+        Args:
+            selector (str): The CSS selector.
+        
+        Returns:
+            etree.XPath: The compiled XPath expression.
+        
+        Raises:
+            cssselect.SelectorError: If the selector cannot be translated to XPath.
+        """
+        return _compile_css_xpath(selector)
+    
+    def compile_schema(self, schema: Union[Dict[str, Any], CompiledSchema]) -> CompiledSchema:
+        """
+        Compile a schema into extraction operations.
+        
+        The selectors are compiled to lxml XPath expressions (backend "lxml"),
+        or to soupsieve selectors (backend "bs4") when any of them uses syntax
+        that cannot be translated to XPath. With config.html_parser set to
+        "selectolax", selectolax is tried first (backend "selectolax").
+        
+        Results are cached per schema object, so scraping many pages with the
+        same schema dict only compiles it once. Schemas are expected not to be
+        modified in place once they have been used.
+        
+        Args:
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what
+                                                           data to extract.
+        
+        Returns:
+            CompiledSchema: The compiled schema (returned as is if already compiled).
+        """
+        if isinstance(schema, CompiledSchema):
+            return schema
+        
+        compiled = self._compiled_schemas.get(id(schema))
+        if compiled is not None and compiled.schema is schema:
+            return compiled
+        
+        fields = []
+        for field_name, field_schema in schema.items():
+            # Simple string selectors
+            if isinstance(field_schema, str):
+                fields.append((field_name, field_schema, True, None, False, (), ()))
+            
+            # Complex schema with selector, attribute, processors, etc.
+            elif isinstance(field_schema, dict):
+                selector = field_schema.get("selector")
+                if not selector:
+                    logger.warning("No selector provided for field '%s'", field_name)
+                    continue
+                
+                fields.append((
+                    field_name,
+                    selector,
+                    False,
+                    field_schema.get("attribute"),
+                    field_schema.get("multiple", False),
+                    tuple(field_schema.get("processors", [])),
+                    tuple(field_schema.get("processors_batch", [])),
+                ))
+        
+        # Pages that cannot match any selector are not worth parsing
+        prefilter = compile_prefilter(selector for _, selector, *_ in fields)
+        
+        compiled = None
+        if self._use_selectolax:
+            try:
+                compiled = CompiledSchema(schema, "selectolax", tuple(
+                    (name, _compile_css_selectolax(selector), *rest) for name, selector, *rest in fields
+                ), prefilter)
+            except SelectolaxError as e:
+                logger.debug("Selector not supported by selectolax (%s), using lxml", e)
+        
+        if compiled is None:
+            try:
+                compiled = CompiledSchema(schema, "lxml", tuple(
+                    (name, self._compile_xpath(selector), *rest) for name, selector, *rest in fields
+                ), prefilter)
+            except SelectorError as e:
+                logger.debug("Selector not supported by lxml (%s), using BeautifulSoup", e)
+                compiled = CompiledSchema(schema, "bs4", tuple(
+                    (name, self._compile(selector).select, *rest) for name, selector, *rest in fields
+                ), prefilter)
+        
+        # The compiled schema references the schema, so its id cannot be reused while cached
+        if len(self._compiled_schemas) >= 128:
+            self._compiled_schemas.clear()
+        self._compiled_schemas[id(schema)] = compiled
+        
+        return compiled
     
-    def scrape(self, url: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def scrape(self, url: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
         """
         Scrape data from a URL using the provided schema.
         
         Args:
             url (str): The URL to scrape.
-            schema (Dict[str, Any]): The schema defining what data to extract.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
         
         Returns:
             Dict[str, Any]: The scraped data.
         """
         raise NotImplementedError("Subclasses must implement this method")
     
+    def extract(self, html: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
+        """
+        Extract data from already fetched HTML using the provided schema.
+        
+        Engines that can parse raw HTML override this so that pages fetched
+        elsewhere (e.g. concurrently by the scraper) can still be processed.
+        
+        Args:
+            html (str): The HTML content of the page.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            Dict[str, Any]: The extracted data.
+        """
+        raise NotImplementedError("This engine does not support extracting from raw HTML")
+    
     def close(self):
         """
         Close the engine and release resources.
@@ -47,6 +275,7 @@ class BaseEngine:
 
 # Registry of available engines
 _engines: Dict[str, Type[BaseEngine]] = {}
+_engines_loaded = False
 
 def register_engine(name: str):
     """
@@ -63,6 +292,28 @@ def register_engine(name: str):
         return cls
     return decorator
 
+def _register_all() -> None:
+    """
+    Import the built-in engine modules so they register themselves.
+    
+    The imports only run on the first call.
+    """
+    global _engines_loaded
+    
+    if _engines_loaded:
+        return
+    
+    # Import engines here to avoid circular imports
+    from .requests_engine import RequestsEngine
+    from .aiohttp_engine import AiohttpEngine
+    from .httpx_engine import HttpxEngine
+    from .bs4_engine import BeautifulSoupEngine
+    from .selenium_engine import SeleniumEngine
+    from .playwright_engine import PlaywrightEngine
+    from .scrapy_engine import ScrapyEngine
+    
+    _engines_loaded = True
+
 def get_engine(name: str, config: ScraperConfig) -> BaseEngine:
     """
     Get an instance of the specified engine.
@@ -77,12 +328,7 @@ def get_engine(name: str, config: ScraperConfig) -> BaseEngine:
     Raises:
         ValueError: If the specified engine is not found.
     """
-    # Import engines here to avoid circular imports
-    from .requests_engine import RequestsEngine
-    from .bs4_engine import BeautifulSoupEngine
-    from .selenium_engine import SeleniumEngine
-    from .playwright_engine import PlaywrightEngine
-    from .scrapy_engine import ScrapyEngine
+    _register_all()
     
     if name not in _engines:
         available_engines = ", ".join(_engines.keys())
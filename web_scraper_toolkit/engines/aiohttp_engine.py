@@ -0,0 +1,319 @@
+"""
+aiohttp-based scraping engine for the Web Scraper Toolkit.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from . import BaseEngine, CompiledSchema, register_engine
+from .requests_engine import RequestsEngine, _RETRY_BACKOFF_FACTOR, _RETRY_BACKOFF_JITTER, _RETRY_STATUSES
+from ..config import ScraperConfig
+from ..utils import _rng
+from ..utils.user_agent_manager import get_random_user_agent
+from ..utils.proxy_manager import _is_http_proxy, get_proxy
+from ..utils.rate_limiter import DomainRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# aiohttp's AsyncResolver needs aiodns; without it the threaded default resolver is used
+_HAS_AIODNS = importlib.util.find_spec("aiodns") is not None
+
+def _is_transient(exception: BaseException) -> bool:
+    """
+    Check whether a failed request is worth retrying.
+    
+    Connection errors, timeouts and transient server errors are retried;
+    client errors such as 404 are not.
+    
+    Args:
+        exception (BaseException): The exception raised by the request.
+    
+    Returns:
+        bool: True if the request should be retried.
+    """
+    if isinstance(exception, aiohttp.ClientResponseError):
+        return exception.status in _RETRY_STATUSES
+    if isinstance(exception, aiohttp.InvalidURL):
+        return False
+    return isinstance(exception, (aiohttp.ClientError, asyncio.TimeoutError))
+
+@register_engine("aiohttp")
+class AiohttpEngine(BaseEngine):
+    """
+    Scraping engine that fetches pages concurrently with aiohttp.
+    
+    Pages are downloaded on an asyncio event loop and the data is extracted
+    by another engine (a RequestsEngine by default) in the loop's default
+    executor, so parsing does not hold up pending downloads. Requests to the
+    same host are spaced by config.request_delay; different hosts are
+    fetched in parallel.
+    
+    Use scrape_many() (or scrape_async()) from async code, optionally inside
+    "async with engine:" to share one HTTP session across several batches.
+    """
+    
+    def __init__(self, config: ScraperConfig, extractor: Optional[BaseEngine] = None):
+        """
+        Initialize the engine with the specified configuration.
+        
+        Args:
+            config (ScraperConfig): Configuration for the engine.
+            extractor (BaseEngine, optional): Engine used to extract data from the
+                                              fetched HTML. It must implement extract().
+                                              Defaults to a RequestsEngine.
+        """
+        super().__init__(config)
+        self._owns_extractor = extractor is None
+        self.extractor = extractor or RequestsEngine(config)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[DomainRateLimiter] = None
+    
+    async def __aenter__(self) -> "AiohttpEngine":
+        """
+        Open the HTTP session used for fetching pages.
+        
+        Returns:
+            AiohttpEngine: The engine itself.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.config.max_concurrency,
+            limit_per_host=self.config.per_host_concurrency,
+            ssl=self.config.verify_ssl,
+            keepalive_timeout=30,
+            # Resolve each host once per session rather than once per request
+            use_dns_cache=True,
+            ttl_dns_cache=self.config.dns_cache_ttl,
+            resolver=aiohttp.AsyncResolver() if _HAS_AIODNS else None
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            headers=self.config.headers,
+            cookies=self.config.cookies,
+            # Like the other engines, read proxies and .netrc credentials from the environment only if asked
+            trust_env=self.config.trust_env
+        )
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._rate_limiter = DomainRateLimiter(self.config.request_delay)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """
+        Close the HTTP session.
+        """
+        await self._session.close()
+        self._session = None
+        self._semaphore = None
+        self._rate_limiter = None
+    
+    def compile_schema(self, schema: Union[Dict[str, Any], CompiledSchema]) -> CompiledSchema:
+        """
+        Compile a schema with the extractor engine.
+        
+        Args:
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what
+                                                           data to extract.
+        
+        Returns:
+            CompiledSchema: The compiled schema.
+        """
+        return self.extractor.compile_schema(schema)
+    
+    def extract(self, html: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
+        """
+        Extract data from already fetched HTML using the extractor engine.
+        
+        Args:
+            html (str): The HTML content of the page.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            Dict[str, Any]: The extracted data.
+        """
+        return self.extractor.extract(html, schema)
+    
+    def scrape(self, url: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
+        """
+        Scrape data from a single URL using the provided schema.
+        
+        A single page gains nothing from an event loop, so this goes through
+        the extractor engine's own scrape().
+        
+        Args:
+            url (str): The URL to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            Dict[str, Any]: The scraped data.
+        """
+        return self.extractor.scrape(url, schema)
+    
+    async def _fetch(self, url: str, headers: Optional[Dict[str, str]], proxy: Optional[str]) -> str:
+        """
+        Fetch a page, retrying connection errors, timeouts and transient server errors.
+        
+        Failed requests are retried up to config.max_retries times, with the
+        same exponential backoff and jitter as RequestsEngine. Every attempt
+        waits for its turn with the rate limiter.
+        
+        Args:
+            url (str): The URL to fetch.
+            headers (Dict[str, str], optional): Headers to send with the request.
+            proxy (str, optional): The HTTP proxy to send the request through.
+        
+        Returns:
+            str: The HTML content of the page.
+        
+        Raises:
+            aiohttp.ClientError: If the request fails.
+            asyncio.TimeoutError: If the request times out.
+        """
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            # Wait for the host's turn before taking a connection slot, so a
+            # slow-paced host does not hold up requests to other hosts
+            await self._rate_limiter.wait(host)
+            
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, headers=headers, proxy=proxy) as response:
+                        response.raise_for_status()
+                        return await response.text()
+            except Exception as e:
+                if attempt >= self.config.max_retries or not _is_transient(e):
+                    raise
+                
+                # Back off 0.3s, 0.6s, 1.2s, ... plus jitter, without holding a connection slot
+                delay = _RETRY_BACKOFF_FACTOR * 2 ** attempt + _rng().uniform(0, _RETRY_BACKOFF_JITTER)
+                attempt += 1
+                logger.warning("Request to %s failed (%s), retrying in %.2f seconds (%s of %s)",
+                               url, e, delay, attempt, self.config.max_retries)
+                await asyncio.sleep(delay)
+    
+    async def scrape_async(self, url: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
+        """
+        Fetch a URL with aiohttp and extract data from it.
+        
+        Must be called inside "async with engine:".
+        
+        Args:
+            url (str): The URL to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            Dict[str, Any]: The scraped data, or an empty dict if the request failed.
+        """
+        logger.info("Scraping URL: %s", url)
+        
+        # Rotate user agent and pick a proxy per request, like RequestsEngine does
+        headers = None
+        if self.config.user_agent_rotation:
+            headers = {"User-Agent": get_random_user_agent(self.config.user_agent_list_path)}
+        
+        proxy = None
+        if self.config.use_proxies:
+            proxy = get_proxy(self.config.proxy_list_path, self.config.proxy_rotation_policy)
+        
+        try:
+            loop = asyncio.get_running_loop()
+            if proxy is not None and not _is_http_proxy(proxy):
+                # aiohttp only supports HTTP proxies, so let the extractor engine
+                # fetch the page (through a proxy of its own) in a worker thread
+                await self._rate_limiter.wait(urlsplit(url).netloc)
+                async with self._semaphore:
+                    return await loop.run_in_executor(None, self.extractor.scrape, url, schema)
+            
+            # requests assumes http:// for proxies given as host:port, aiohttp needs the scheme
+            if proxy is not None and "://" not in proxy:
+                proxy = f"http://{proxy}"
+            
+            html = await self._fetch(url, headers, proxy)
+            
+            # Parse in a worker thread so other downloads keep progressing
+            result = await loop.run_in_executor(None, self.extractor.extract, html, schema)
+            logger.info("Successfully scraped %s", url)
+            return result
+        except Exception as e:
+            logger.error("Error scraping %s: %s", url, e)
+            return {}
+    
+    async def scrape_many(self, urls: List[str],
+                          schema: Union[Dict[str, Any], CompiledSchema]) -> List[Dict[str, Any]]:
+        """
+        Scrape multiple URLs concurrently.
+        
+        At most config.max_concurrency requests are in flight at once, and
+        requests to the same host are spaced by config.request_delay. A
+        session is opened for the call unless one is already open.
+        
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            List[Dict[str, Any]]: The scraped data for each URL, in the same order as urls
+                                  (an empty dict where scraping failed).
+        """
+        if self._session is None:
+            async with self:
+                return await self.scrape_many(urls, schema)
+        
+        # Compile once here instead of in every worker thread
+        schema = self.compile_schema(schema)
+        
+        return await asyncio.gather(*(self.scrape_async(url, schema) for url in urls))
+    
+    async def scrape_iter(self, urls: List[str],
+                          schema: Union[Dict[str, Any], CompiledSchema]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scrape multiple URLs concurrently, yielding each result as soon as it is ready.
+        
+        Works like scrape_many(), but results are not held until the whole
+        batch is done. Breaking out of the loop cancels the pending requests.
+        
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Yields:
+            Tuple[int, Dict[str, Any]]: The index of the URL in urls and its scraped data
+                                        (an empty dict where scraping failed), in
+                                        completion order.
+        """
+        # Open a session for the call unless one is already open, and close it
+        # only after any pending requests have been cancelled
+        owns_session = self._session is None
+        if owns_session:
+            await self.__aenter__()
+        
+        # Compile once here instead of in every worker thread
+        schema = self.compile_schema(schema)
+        
+        async def scrape_url(index: int, url: str) -> Tuple[int, Dict[str, Any]]:
+            return index, await self.scrape_async(url, schema)
+        
+        tasks = [asyncio.ensure_future(scrape_url(index, url)) for index, url in enumerate(urls)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if owns_session:
+                await self.__aexit__(None, None, None)
+    
+    def close(self):
+        """
+        Close the engine and release resources.
+        """
+        if self._owns_extractor:
+            self.extractor.close()
+        logger.debug("aiohttp engine closed")
@@ -0,0 +1,67 @@
+"""
+Raw HTML prefilter for schemas with simple selectors.
+"""
+
+import re
+from typing import Callable, Iterable, List, Optional
+
+# Selectors made of tag names, classes and ids, optionally chained with descendant combinators
+_SIMPLE_SELECTOR = re.compile(r"^[.#]?[A-Za-z0-9_-]+(?: +[.#]?[A-Za-z0-9_-]+)*$")
+
+# Elements the HTML parsers can create without their start tag appearing in the page,
+# following the HTML5 tree construction rules: html, head and body are implied, a
+# table implies tbody around rows, tr around bare cells and colgroup around cols,
+# <image> is parsed as <img>, and stray </p> and </br> end tags create p and br.
+# lxml also wraps text outside of any element in a p.
+_IMPLIED_TAGS = frozenset({"html", "head", "body", "tbody", "tr", "colgroup", "img", "p", "br"})
+
+def compile_prefilter(selectors: Iterable[str]) -> Optional[Callable[[str], bool]]:
+    """
+    Build a check telling whether any of the selectors can match a page.
+    
+    An element matched by a simple selector needs the tag name, class or id of
+    its last part to appear in the HTML source, so pages missing all of them
+    can be skipped without being parsed. The check may report a page that has
+    no matches (the text may appear elsewhere, e.g. in a script), but never
+    misses one.
+    
+    Args:
+        selectors (Iterable[str]): The CSS selectors of a schema.
+    
+    Returns:
+        Optional[Callable[[str], bool]]: A function returning False for HTML that none of the
+                                         selectors can match, or None if a selector is not
+                                         simple enough to check this way.
+    """
+    literals: List[str] = []
+    patterns: List[str] = []
+    for selector in selectors:
+        selector = selector.strip()
+        if not _SIMPLE_SELECTOR.match(selector):
+            return None
+        
+        last = selector.rsplit(" ", 1)[-1]
+        if last[0] in ".#":
+            literals.append(last[1:])
+            patterns.append(re.escape(last[1:]))
+        elif last.lower() in _IMPLIED_TAGS:
+            return None
+        else:
+            literals.append("<" + last.lower())
+            patterns.append("<%s(?![A-Za-z0-9_-])" % re.escape(last))
+    
+    if not literals:
+        return None
+    
+    # Tag names are case-insensitive, and so are classes and ids on pages parsed in
+    # quirks mode by selectolax. Pages almost always use the exact (lowercase tag)
+    # spelling, so look for that first and only search case-insensitively without it.
+    pattern = re.compile("|".join(patterns), re.IGNORECASE)
+    
+    def may_match(html: str) -> bool:
+        for literal in literals:
+            if literal in html:
+                return True
+        return pattern.search(html) is not None
+    
+    return may_match
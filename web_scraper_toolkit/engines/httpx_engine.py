@@ -0,0 +1,188 @@
+"""
+httpx-based scraping engine for the Web Scraper Toolkit.
+"""
+
+import importlib.util
+import logging
+from typing import Dict, Optional, Tuple
+import lxml.html
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential, wait_random
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from . import BaseEngine, register_engine
+from .requests_engine import RequestsEngine, _RETRY_STATUSES, _STREAM_CHUNK_SIZE
+from ..config import ScraperConfig
+from ..utils.user_agent_manager import get_random_user_agent
+from ..utils.proxy_manager import get_proxy
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 support in httpx needs the h2 package (installed by httpx[http2])
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+def _is_transient(exception: BaseException) -> bool:
+    """
+    Check whether a failed request is worth retrying.
+    
+    Connection errors, timeouts and transient server errors are retried;
+    client errors such as 404 are not.
+    
+    Args:
+        exception (BaseException): The exception raised by the request.
+    
+    Returns:
+        bool: True if the request should be retried.
+    """
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code in _RETRY_STATUSES
+    return isinstance(exception, httpx.TransportError)
+
+# Retry transient failures up to 3 attempts, backing off exponentially (up to
+# 2s) with random jitter so concurrent workers do not retry in lockstep
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, max=2) + wait_random(0, 0.2),
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+@register_engine("httpx")
+class HttpxEngine(RequestsEngine):
+    """
+    Scraping engine based on httpx, with HTTP/2 when available.
+    
+    Pages are fetched with an httpx client, which multiplexes concurrent
+    requests to hosts that speak HTTP/2 over a single connection. Data is
+    extracted the same way as in RequestsEngine.
+    """
+    
+    def __init__(self, config: ScraperConfig):
+        """
+        Initialize the engine with the specified configuration.
+        
+        Args:
+            config (ScraperConfig): Configuration for the engine.
+        
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("The httpx engine requires httpx: pip install 'httpx[http2]'")
+        
+        # Skip RequestsEngine.__init__, which sets up a requests session
+        BaseEngine.__init__(self, config)
+        
+        # httpx binds proxies to a client, so one client is kept per proxy
+        self.client = self._create_client()
+        self._proxy_clients: Dict[str, httpx.Client] = {}
+    
+    def _create_client(self, proxy: Optional[str] = None) -> "httpx.Client":
+        """
+        Create an httpx client using the engine configuration.
+        
+        Args:
+            proxy (str, optional): The proxy URL to route requests through.
+        
+        Returns:
+            httpx.Client: The client.
+        """
+        return httpx.Client(
+            http2=_HAS_H2,
+            headers=self.config.headers,
+            cookies=self.config.cookies,
+            verify=self.config.verify_ssl,
+            trust_env=self.config.trust_env,
+            timeout=self.config.timeout,
+            proxy=proxy,
+            limits=httpx.Limits(
+                max_keepalive_connections=self.config.pool_maxsize,
+                max_connections=self.config.pool_connections * self.config.pool_maxsize
+            )
+        )
+    
+    def _prepare_request(self) -> Tuple["httpx.Client", Optional[Dict[str, str]]]:
+        """
+        Pick the client and per-request headers for the next request.
+        
+        Returns:
+            Tuple[httpx.Client, Optional[Dict[str, str]]]: The client (bound to a proxy
+                                                          if enabled) and extra headers.
+        """
+        client = self.client
+        
+        # Get proxy if enabled
+        if self.config.use_proxies:
+            proxy = get_proxy(self.config.proxy_list_path, self.config.proxy_rotation_policy)
+            if proxy:
+                client = self._proxy_clients.get(proxy)
+                if client is None:
+                    new_client = self._create_client(proxy)
+                    # Another thread may have created a client for this proxy meanwhile
+                    client = self._proxy_clients.setdefault(proxy, new_client)
+                    if client is not new_client:
+                        new_client.close()
+        
+        # Rotate user agent if enabled
+        headers = None
+        if self.config.user_agent_rotation:
+            headers = {"User-Agent": get_random_user_agent(self.config.user_agent_list_path)}
+        
+        return client, headers
+    
+    @_retry_transient
+    def _fetch_page(self, url: str) -> str:
+        """
+        Fetch a web page.
+        
+        Args:
+            url (str): The URL to fetch.
+        
+        Returns:
+            str: The HTML content of the page.
+        
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        client, headers = self._prepare_request()
+        
+        # Make the request
+        response = client.get(url, headers=headers, follow_redirects=True)
+        
+        # Raise an exception for bad status codes
+        response.raise_for_status()
+        
+        return response.text
+    
+    @_retry_transient
+    def _fetch_and_parse(self, url: str) -> Optional[lxml.html.HtmlElement]:
+        """
+        Fetch a web page and parse it with lxml while it downloads.
+        
+        Args:
+            url (str): The URL to fetch.
+        
+        Returns:
+            Optional[lxml.html.HtmlElement]: The root element, or None if the document is empty.
+        
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        client, headers = self._prepare_request()
+        
+        with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+            response.raise_for_status()
+            return self._parse_chunks(response.iter_bytes(_STREAM_CHUNK_SIZE), response.charset_encoding)
+    
+    def close(self):
+        """
+        Close the engine and release resources.
+        """
+        self.client.close()
+        for client in self._proxy_clients.values():
+            client.close()
+        self._proxy_clients.clear()
+        logger.debug("httpx engine closed")
@@ -3,19 +3,196 @@ Requests-based scraping engine for the Web Scraper Toolkit.
 """
 
 import logging
+from inspect import signature
 import requests
-from typing import Dict, List, Any, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union, Callable
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+import threading
 import time
-from tenacity import retry, stop_after_attempt, wait_fixed
 
-from . import BaseEngine, register_engine
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+from . import BaseEngine, CompiledSchema, register_engine
 from ..config import ScraperConfig
 from ..utils.user_agent_manager import get_random_user_agent
 from ..utils.proxy_manager import get_proxy
 
 logger = logging.getLogger(__name__)
 
+# Text nodes of an element, skipping <script>, <style> and <template> contents
+# the same way BeautifulSoup's get_text() does
+_text_nodes = etree.XPath(
+    "descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False
+)
+_RAW_TEXT_TAGS = {"script", "style", "template"}
+
+# Size of the body chunks fed to the parser when streaming a page
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Retry policy for failed requests: transient server errors are retried with
+# an exponential backoff (0.3s, 0.6s, 1.2s, ...) plus up to 0.3s of random
+# jitter, so concurrent workers do not retry against a host in lockstep
+_RETRY_STATUSES = (502, 503, 504)
+_RETRY_BACKOFF_FACTOR = 0.3
+_RETRY_BACKOFF_JITTER = 0.3
+
+# Retry only supports jitter from urllib3 2.0 on
+_retry_options = {"backoff_jitter": _RETRY_BACKOFF_JITTER} if "backoff_jitter" in signature(Retry).parameters else {}
+
+# HTML parsers reused across pages, one per thread and encoding since lxml
+# parsers cannot be shared between threads
+_parsers = threading.local()
+
+# Attributes BeautifulSoup returns as lists of values rather than strings
+_MULTI_VALUED_ATTRIBUTES = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"},
+    "link": {"rel", "rev"},
+    "td": {"headers"},
+    "th": {"headers"},
+    "form": {"accept-charset"},
+    "object": {"archive"},
+    "area": {"rel"},
+    "icon": {"sizes"},
+    "iframe": {"sandbox"},
+    "output": {"for"},
+}
+
+def _lxml_text(element: lxml.html.HtmlElement) -> str:
+    """
+    Get the text content of an lxml element, like get_text(strip=True).
+    
+    Args:
+        element (lxml.html.HtmlElement): The element.
+    
+    Returns:
+        str: The stripped text pieces of the element, concatenated.
+    """
+    if element.tag in _RAW_TEXT_TAGS:
+        return (element.text or "").strip()
+    return "".join(text.strip() for text in _text_nodes(element))
+
+def _lxml_attribute(element: lxml.html.HtmlElement, attribute: str) -> Union[str, List[str], None]:
+    """
+    Get an attribute value of an lxml element, like BeautifulSoup's Tag.get.
+    
+    Args:
+        element (lxml.html.HtmlElement): The element.
+        attribute (str): The attribute name.
+    
+    Returns:
+        Union[str, List[str], None]: The attribute value, split into a list for
+                                     multi-valued attributes such as "class".
+    """
+    value = element.get(attribute)
+    if value is not None and (
+        attribute in _MULTI_VALUED_ATTRIBUTES["*"]
+        or attribute in _MULTI_VALUED_ATTRIBUTES.get(element.tag, ())
+    ):
+        return value.split()
+    return value
+
+def _selectolax_text(node: Any) -> str:
+    """
+    Get the text content of a selectolax node, like get_text(strip=True).
+    
+    Args:
+        node (Any): The selectolax node.
+    
+    Returns:
+        str: The stripped text pieces of the node, concatenated.
+    """
+    # text() includes <script>, <style> and <template> contents, so nodes
+    # containing those are walked in Python to leave them out
+    if node.tag in _RAW_TEXT_TAGS or node.css_first("script, style, template") is None:
+        return node.text(strip=True)
+    
+    pieces = []
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            pieces.append(child.text(strip=True))
+        elif not child.tag.startswith("-") and child.tag not in _RAW_TEXT_TAGS:
+            pieces.append(_selectolax_text(child))
+    return "".join(pieces)
+
+def _selectolax_attribute(node: Any, attribute: str) -> Union[str, List[str], None]:
+    """
+    Get an attribute value of a selectolax node, like BeautifulSoup's Tag.get.
+    
+    Args:
+        node (Any): The selectolax node.
+        attribute (str): The attribute name.
+    
+    Returns:
+        Union[str, List[str], None]: The attribute value, split into a list for
+                                     multi-valued attributes such as "class".
+    """
+    attributes = node.attributes
+    if attribute not in attributes:
+        return None
+    
+    # Attributes without a value (e.g. <input disabled>) come back as None
+    value = attributes[attribute] or ""
+    if attribute in _MULTI_VALUED_ATTRIBUTES["*"] or attribute in _MULTI_VALUED_ATTRIBUTES.get(node.tag, ()):
+        return value.split()
+    return value
+
+def _soup_text(element: Any) -> str:
+    """
+    Get the stripped text content of a BeautifulSoup element.
+    
+    Args:
+        element (Any): The BeautifulSoup tag.
+    
+    Returns:
+        str: The text content.
+    """
+    return element.get_text(strip=True)
+
+def _soup_attribute(element: Any, attribute: str) -> Any:
+    """
+    Get an attribute value of a BeautifulSoup element.
+    
+    Args:
+        element (Any): The BeautifulSoup tag.
+        attribute (str): The attribute name.
+    
+    Returns:
+        Any: The attribute value, or None if not present.
+    """
+    return element.get(attribute)
+
+def _get_html_parser(encoding: Optional[str] = None) -> lxml.html.HTMLParser:
+    """
+    Get the calling thread's lxml HTML parser for an encoding.
+    
+    Creating a parser sets up a new libxml2 parser context, so each thread
+    keeps one per encoding and reuses it for every page.
+    
+    Args:
+        encoding (str, optional): The document encoding, or None to detect it.
+    
+    Returns:
+        lxml.html.HTMLParser: The parser.
+    """
+    try:
+        cache = _parsers.cache
+    except AttributeError:
+        cache = _parsers.cache = {}
+    
+    parser = cache.get(encoding)
+    if parser is None:
+        parser = cache[encoding] = lxml.html.HTMLParser(encoding=encoding)
+    return parser
+
 @register_engine("requests")
 class RequestsEngine(BaseEngine):
     """
@@ -25,6 +202,9 @@ class RequestsEngine(BaseEngine):
     to parse the HTML and extract data.
     """
     
+    # The session's connection pool is shared safely between threads
+    thread_safe = True
+    
     def __init__(self, config: ScraperConfig):
         """
         Initialize the engine with the specified configuration.
@@ -35,30 +215,51 @@ class RequestsEngine(BaseEngine):
         super().__init__(config)
         self.session = requests.Session()
         
+        # Keep a connection pool per host so keep-alive connections (and their
+        # TCP/TLS handshakes) are reused across requests, and retry connection
+        # errors and transient server errors at the connection pool level
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=Retry(
+                total=config.max_retries,
+                backoff_factor=_RETRY_BACKOFF_FACTOR,
+                status_forcelist=_RETRY_STATUSES,
+                raise_on_status=False,
+                **_retry_options
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         # Set default headers
         self.session.headers.update(config.headers)
         
+        # Skip looking up proxies and .netrc credentials in the environment on every request
+        self.session.trust_env = config.trust_env
+        
         # Set cookies if provided
         if config.cookies:
             self.session.cookies.update(config.cookies)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def _fetch_page(self, url: str) -> str:
+    def _request(self, url: str, stream: bool = False) -> requests.Response:
         """
-        Fetch a web page.
+        Send a GET request for a web page.
         
         Args:
             url (str): The URL to fetch.
+            stream (bool): Whether to leave the body unread so it can be streamed.
         
         Returns:
-            str: The HTML content of the page.
+            requests.Response: The response.
         
         Raises:
             requests.RequestException: If the request fails.
         """
-        # Rotate user agent if enabled
+        # Rotate user agent if enabled, per request so threads do not race on the session headers
+        headers = None
         if self.config.user_agent_rotation:
-            self.session.headers["User-Agent"] = get_random_user_agent(self.config.user_agent_list_path)
+            headers = {"User-Agent": get_random_user_agent(self.config.user_agent_list_path)}
         
         # Get proxy if enabled
         proxies = None
@@ -73,111 +274,225 @@ class RequestsEngine(BaseEngine):
         # Make the request
         response = self.session.get(
             url,
+            headers=headers,
             timeout=self.config.timeout,
             verify=self.config.verify_ssl,
-            proxies=proxies
+            proxies=proxies,
+            stream=stream
         )
         
         # Raise an exception for bad status codes
-        response.raise_for_status()
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        
+        return response
+    
+    def _fetch_page(self, url: str) -> str:
+        """
+        Fetch a web page.
+        
+        Args:
+            url (str): The URL to fetch.
+        
+        Returns:
+            str: The HTML content of the page.
         
-        return response.text
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        return self._request(url).text
     
-    def _extract_data(self, soup: BeautifulSoup, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def _fetch_and_parse(self, url: str) -> Optional[lxml.html.HtmlElement]:
         """
-        Extract data from a BeautifulSoup object using the provided schema.
+        Fetch a web page and parse it with lxml while it downloads.
+        
+        The body is fed to the parser in chunks, so the whole page is never
+        held in memory as bytes and as a decoded string next to the tree.
         
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object.
-            schema (Dict[str, Any]): The schema defining what data to extract.
+            url (str): The URL to fetch.
+        
+        Returns:
+            Optional[lxml.html.HtmlElement]: The root element, or None if the document is empty.
+        
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        with self._request(url, stream=True) as response:
+            # Only trust an explicit charset; otherwise lxml detects it from the document
+            encoding = response.encoding if "charset=" in response.headers.get("Content-Type", "").lower() else None
+            return self._parse_chunks(response.iter_content(_STREAM_CHUNK_SIZE), encoding)
+    
+    def _parse_chunks(self, chunks: Iterable[bytes],
+                      encoding: Optional[str] = None) -> Optional[lxml.html.HtmlElement]:
+        """
+        Parse HTML incrementally from chunks of bytes.
+        
+        Args:
+            chunks (Iterable[bytes]): The raw (decompressed) body chunks.
+            encoding (str, optional): The document encoding, if known.
+        
+        Returns:
+            Optional[lxml.html.HtmlElement]: The root element, or None if the document is empty.
+        """
+        parser = _get_html_parser(encoding)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+        except BaseException:
+            # Reset the parser so the next page does not continue this document
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            raise
+        
+        try:
+            return parser.close()
+        except etree.XMLSyntaxError:
+            # Nothing was fed to the parser
+            return None
+    
+    def _parse_html(self, html: str) -> Optional[lxml.html.HtmlElement]:
+        """
+        Parse HTML into an lxml document.
+        
+        Args:
+            html (str): The HTML content of the page.
+        
+        Returns:
+            Optional[lxml.html.HtmlElement]: The root element, or None if the document is empty.
+        """
+        try:
+            return lxml.html.document_fromstring(html, parser=_get_html_parser())
+        except ValueError:
+            # lxml refuses str input that starts with an XML encoding declaration
+            return lxml.html.document_fromstring(html.encode("utf-8"), parser=_get_html_parser("utf-8"))
+        except etree.ParserError:
+            return None
+    
+    def _extract_data(self, document: Any, fields: Tuple[tuple, ...],
+                      get_text: Callable[[Any], str],
+                      get_attribute: Callable[[Any, str], Any]) -> Dict[str, Any]:
+        """
+        Extract data from a parsed document using a schema plan.
+        
+        Args:
+            document (Any): The parsed document (lxml root element, selectolax parser
+                            or BeautifulSoup object).
+            fields (Tuple[tuple, ...]): The compiled schema fields (see CompiledSchema).
+            get_text (Callable[[Any], str]): Returns the text content of an element.
+            get_attribute (Callable[[Any, str], Any]): Returns an attribute value of an element.
         
         Returns:
             Dict[str, Any]: The extracted data.
         """
         result = {}
         
-        for field_name, field_schema in schema.items():
+        for field_name, select, simple, attribute, multiple, processors, batch_processors in fields:
+            elements = select(document) if document is not None else []
+            
             # Handle simple string selectors
-            if isinstance(field_schema, str):
-                selector = field_schema
-                elements = soup.select(selector)
-                
+            if simple:
                 if elements:
                     # If multiple elements found, get all text
                     if len(elements) > 1:
-                        result[field_name] = [element.get_text(strip=True) for element in elements]
+                        result[field_name] = [get_text(element) for element in elements]
                     else:
                         # Single element, get text
-                        result[field_name] = elements[0].get_text(strip=True)
+                        result[field_name] = get_text(elements[0])
                 else:
                     result[field_name] = None
+                continue
             
             # Handle complex schema with selector, attribute, processors, etc.
-            elif isinstance(field_schema, dict):
-                selector = field_schema.get("selector")
-                attribute = field_schema.get("attribute")
-                multiple = field_schema.get("multiple", False)
-                processors = field_schema.get("processors", [])
-                
-                if not selector:
-                    logger.warning(f"No selector provided for field '{field_name}'")
-                    continue
-                
-                elements = soup.select(selector)
-                
-                if not elements:
-                    result[field_name] = [] if multiple else None
-                    continue
-                
-                # Extract data from elements
-                extracted_data = []
-                for element in elements:
-                    if attribute:
-                        # Get attribute value
-                        value = element.get(attribute)
-                    else:
-                        # Get text content
-                        value = element.get_text(strip=True)
-                    
-                    # Apply processors
-                    for processor in processors:
-                        if value is not None:
-                            value = processor(value)
-                    
-                    extracted_data.append(value)
-                
-                # Set result based on whether multiple values are expected
-                if multiple:
-                    result[field_name] = extracted_data
-                else:
-                    result[field_name] = extracted_data[0] if extracted_data else None
+            if not elements:
+                result[field_name] = [] if multiple else None
+                continue
+            
+            # Only the first value is kept for single-value fields, unless batch
+            # processors need to see all of them
+            if not multiple and not batch_processors:
+                elements = elements[:1]
+            
+            # Extract data from elements
+            if attribute:
+                extracted_data = [get_attribute(element, attribute) for element in elements]
+            else:
+                extracted_data = [get_text(element) for element in elements]
+            
+            # Apply processors to each value, skipping missing values
+            for processor in processors:
+                extracted_data = [None if value is None else processor(value) for value in extracted_data]
+            
+            # Apply batch processors to all values of the field at once, missing
+            # values included as None so the values stay aligned with the elements
+            for batch_processor in batch_processors:
+                extracted_data = list(batch_processor(extracted_data))
+            
+            # Set result based on whether multiple values are expected
+            if multiple:
+                result[field_name] = extracted_data
+            else:
+                result[field_name] = extracted_data[0] if extracted_data else None
         
         return result
     
-    def scrape(self, url: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def extract(self, html: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
+        """
+        Extract data from already fetched HTML using the provided schema.
+        
+        Args:
+            html (str): The HTML content of the page.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Returns:
+            Dict[str, Any]: The extracted data.
+        """
+        compiled = self.compile_schema(schema)
+        
+        if compiled.prefilter is not None and not compiled.prefilter(html):
+            # None of the selectors can match, so every field is empty
+            return self._extract_data(None, compiled.fields, _lxml_text, _lxml_attribute)
+        
+        if compiled.backend == "lxml":
+            return self._extract_data(self._parse_html(html), compiled.fields, _lxml_text, _lxml_attribute)
+        
+        if compiled.backend == "selectolax":
+            return self._extract_data(LexborHTMLParser(html), compiled.fields, _selectolax_text, _selectolax_attribute)
+        
+        soup = BeautifulSoup(html, "lxml")
+        return self._extract_data(soup, compiled.fields, _soup_text, _soup_attribute)
+    
+    def scrape(self, url: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
         """
         Scrape data from a URL using the provided schema.
         
         Args:
             url (str): The URL to scrape.
-            schema (Dict[str, Any]): The schema defining what data to extract.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
         
         Returns:
             Dict[str, Any]: The scraped data.
         """
         try:
-            # Fetch the page
-            html = self._fetch_page(url)
+            compiled = self.compile_schema(schema)
             
-            # Parse the HTML
-            soup = BeautifulSoup(html, "lxml")
+            # Parse lxml documents while they download
+            if compiled.backend == "lxml":
+                document = self._fetch_and_parse(url)
+                return self._extract_data(document, compiled.fields, _lxml_text, _lxml_attribute)
             
-            # Extract data
-            result = self._extract_data(soup, schema)
+            # Fetch the page
+            html = self._fetch_page(url)
             
-            return result
+            # Parse the HTML and extract data
+            return self.extract(html, compiled)
         except Exception as e:
-            logger.error(f"Error scraping {url}: {str(e)}")
+            logger.error("Error scraping %s: %s", url, e)
             return {}
     
     def close(self):
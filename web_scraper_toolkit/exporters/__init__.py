@@ -3,10 +3,51 @@ Data exporters for the Web Scraper Toolkit.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Type, Union
+import os
+from typing import IO, Dict, List, Any, Optional, Set, Tuple, Type, Union
+
+try:
+    from isal import igzip as _gzip
+    # ISA-L levels go from 0 to 3; 3 compresses about as well as zlib's default level
+    _GZIP_COMPRESSLEVEL = 3
+except ImportError:
+    import gzip as _gzip
+    _GZIP_COMPRESSLEVEL = 6
 
 logger = logging.getLogger(__name__)
 
+def _open_gzip(path: str, mode: str = 'wb', **kwargs) -> IO:
+    """
+    Open a gzip file for writing, using ISA-L's faster compressor when available.
+    
+    Args:
+        path (str): The path of the gzip file.
+        mode (str, optional): The file mode ('wb' or 'wt'). Default is 'wb'.
+        **kwargs: Extra arguments for text mode (encoding, newline).
+    
+    Returns:
+        IO: The opened file.
+    """
+    return _gzip.open(path, mode, compresslevel=_GZIP_COMPRESSLEVEL, **kwargs)
+
+# Output directories already created (or found to exist) during this process
+_created_dirs: Set[str] = set()
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create the parent directory of an output file if needed.
+    
+    Directories are only checked once per process, so repeated exports to the
+    same folder skip the filesystem calls.
+    
+    Args:
+        path (str): The path of the output file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
 class BaseExporter:
     """
     Base class for all data exporters.
@@ -27,28 +68,73 @@ class BaseExporter:
 
 # Registry of available exporters
 _exporters: Dict[str, Type[BaseExporter]] = {}
+_exporters_loaded = False
 
-def register_exporter(name: str):
+# Exporter instances, created on first use; exporters keep no per-export state
+_instances: Dict[str, BaseExporter] = {}
+
+# Requested names and extensions already resolved to an exporter name
+_resolved_names: Dict[str, str] = {}
+
+# Map file extensions to exporter names
+_extension_map: Dict[str, str] = {
+    "json": "json",
+    "csv": "csv",
+    "xlsx": "excel",
+    "xls": "excel",
+    "db": "sqlite",
+    "sqlite": "sqlite",
+    "sqlite3": "sqlite"
+}
+
+def register_exporter(name: str, extensions: Tuple[str, ...] = ()):
     """
     Decorator to register an exporter.
     
     Args:
         name (str): The name of the exporter.
+        extensions (Tuple[str, ...], optional): File extensions handled by the exporter,
+                                               with or without the leading dot.
     
     Returns:
         Callable: The decorator function.
     """
     def decorator(cls):
         _exporters[name] = cls
+        for extension in extensions:
+            _extension_map[extension.lower().lstrip(".")] = name
+        _instances.pop(name, None)
+        _resolved_names.clear()
         return cls
     return decorator
 
+def _register_all() -> None:
+    """
+    Import the built-in exporter modules so they register themselves.
+    
+    The imports only run on the first call.
+    """
+    global _exporters_loaded
+    
+    if _exporters_loaded:
+        return
+    
+    # Import exporters here to avoid circular imports
+    from .json_exporter import JSONExporter
+    from .csv_exporter import CSVExporter
+    from .parquet_exporter import ParquetExporter
+    from .excel_exporter import ExcelExporter
+    from .sqlite_exporter import SQLiteExporter
+    
+    _exporters_loaded = True
+
 def get_exporter(name: str) -> BaseExporter:
     """
     Get an instance of the specified exporter.
     
     Args:
-        name (str): The name of the exporter.
+        name (str): The name of the exporter or a file extension, with or without
+                    the leading dot.
     
     Returns:
         BaseExporter: An instance of the specified exporter.
@@ -56,33 +142,21 @@ def get_exporter(name: str) -> BaseExporter:
     Raises:
         ValueError: If the specified exporter is not found.
     """
-    # Import exporters here to avoid circular imports
-    from .json_exporter import JSONExporter
-    from .csv_exporter import CSVExporter
-    from .excel_exporter import ExcelExporter
-    from .sqlite_exporter import SQLiteExporter
+    resolved = _resolved_names.get(name)
+    if resolved is None:
+        _register_all()
+        
+        # Normalize name and map it to an exporter name if it's a file extension
+        resolved = name.lower().lstrip(".")
+        resolved = _extension_map.get(resolved, resolved)
+        
+        if resolved not in _exporters:
+            available_exporters = ", ".join(_exporters.keys())
+            raise ValueError(f"Exporter '{resolved}' not found. Available exporters: {available_exporters}")
+        
+        _resolved_names[name] = resolved
     
-    # Normalize name
-    name = name.lower()
-    
-    # Map file extensions to exporter names
-    extension_map = {
-        "json": "json",
-        "csv": "csv",
-        "xlsx": "excel",
-        "xls": "excel",
-        "db": "sqlite",
-        "sqlite": "sqlite",
-        "sqlite3": "sqlite"
-    }
-    
-    # Map name to exporter name if it's a file extension
-    if name in extension_map:
-        name = extension_map[name]
-    
-    if name not in _exporters:
-        available_exporters = ", ".join(_exporters.keys())
-        raise ValueError(f"Exporter '{name}' not found. Available exporters: {available_exporters}")
-    
-    exporter_cls = _exporters[name]
-    return exporter_cls()
\ No newline at end of file
+    exporter = _instances.get(resolved)
+    if exporter is None:
+        exporter = _instances[resolved] = _exporters[resolved]()
+    return exporter
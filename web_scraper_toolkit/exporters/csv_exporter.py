@@ -4,13 +4,62 @@ CSV exporter for the Web Scraper Toolkit.
 
 import csv
 import logging
-import os
-from typing import Dict, List, Any, Union, Optional
+from operator import itemgetter
+from typing import Dict, Iterator, List, Any, Union, Optional
 
-from . import BaseExporter, register_exporter
+from . import BaseExporter, _ensure_dir, _open_gzip, register_exporter
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for CSV files, so large exports need fewer write calls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Below this many rows, export_with_arrow uses the csv module; building an
+# Arrow table only pays off for larger exports
+_ARROW_MIN_ROWS = 1000
+
+def _collect_fieldnames(data: List[Dict[str, Any]]) -> List[str]:
+    """
+    Collect the keys of all items, in the order they are first seen.
+    
+    Args:
+        data (List[Dict[str, Any]]): The items to export.
+    
+    Returns:
+        List[str]: The CSV column names.
+    """
+    return list(dict.fromkeys(key for item in data for key in item))
+
+def _iter_rows(data: List[Dict[str, Any]], fieldnames: List[str]) -> Iterator[tuple]:
+    """
+    Prepare items as CSV rows, converting list and dict values to strings.
+    
+    Args:
+        data (List[Dict[str, Any]]): The items to export.
+        fieldnames (List[str]): The CSV column names.
+    
+    Yields:
+        tuple: The row values for each item, in fieldnames order ("" for missing keys).
+    """
+    if not fieldnames:
+        # Items without any keys (e.g. failed scrapes) are written as empty rows
+        for _ in data:
+            yield ()
+        return
+    
+    defaults = dict.fromkeys(fieldnames, "")
+    getter = itemgetter(*fieldnames)
+    single_field = len(fieldnames) == 1
+    str_ = str
+    isinstance_ = isinstance
+    nested_types = (list, dict)
+    for item in data:
+        values = getter({**defaults, **item})
+        if single_field:
+            # itemgetter returns a bare value rather than a tuple for one field
+            values = (values,)
+        yield tuple(str_(value) if isinstance_(value, nested_types) else value for value in values)
+
 @register_exporter("csv")
 class CSVExporter(BaseExporter):
     """
@@ -32,7 +81,7 @@ class CSVExporter(BaseExporter):
             encoding (str, optional): The encoding to use. Default is 'utf-8'.
         """
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         # Convert single dict to list
         if isinstance(data, dict):
@@ -46,39 +95,23 @@ class CSVExporter(BaseExporter):
             return
         
         try:
-            # Get fieldnames from the first item
-            fieldnames = list(data[0].keys())
-            
-            # Add any additional fields from other items
-            for item in data[1:]:
-                for key in item.keys():
-                    if key not in fieldnames:
-                        fieldnames.append(key)
+            # Get fieldnames from all items, in first-seen order
+            fieldnames = _collect_fieldnames(data)
             
-            with open(output_path, 'w', encoding=encoding, newline='') as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=fieldnames, delimiter=delimiter, quotechar=quotechar,
-                    quoting=csv.QUOTE_MINIMAL
+            with open(output_path, 'w', encoding=encoding, newline='', buffering=_WRITE_BUFFER_SIZE) as f:
+                writer = csv.writer(
+                    f, delimiter=delimiter, quotechar=quotechar, quoting=csv.QUOTE_MINIMAL
                 )
                 
                 # Write header
-                writer.writeheader()
+                writer.writerow(fieldnames)
                 
-                # Write data
-                for item in data:
-                    # Convert any non-string values to strings
-                    row = {}
-                    for key, value in item.items():
-                        if isinstance(value, (list, dict)):
-                            row[key] = str(value)
-                        else:
-                            row[key] = value
-                    
-                    writer.writerow(row)
+                # Write data, converting list and dict values to strings
+                writer.writerows(_iter_rows(data, fieldnames))
             
-            logger.info(f"Data exported to CSV file: {output_path}")
+            logger.info("Data exported to CSV file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to CSV file: {str(e)}")
+            logger.error("Error exporting data to CSV file: %s", e)
             raise
     
     def export_with_pandas(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str,
@@ -99,7 +132,7 @@ class CSVExporter(BaseExporter):
             raise ImportError("pandas is required for export_with_pandas")
         
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         # Convert single dict to list
         if isinstance(data, dict):
@@ -119,9 +152,65 @@ class CSVExporter(BaseExporter):
             # Export to CSV
             df.to_csv(output_path, index=index, encoding=encoding)
             
-            logger.info(f"Data exported to CSV file using pandas: {output_path}")
+            logger.info("Data exported to CSV file using pandas: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to CSV file using pandas: {str(e)}")
+            logger.error("Error exporting data to CSV file using pandas: %s", e)
+            raise
+    
+    def export_with_arrow(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str,
+                          delimiter: str = ',') -> None:
+        """
+        Export data to a CSV file using pyarrow's C++ CSV writer.
+        
+        Columns are typed by pyarrow, so booleans are written as true/false and
+        string values are always quoted. Small exports are written with export()
+        instead.
+        
+        Args:
+            data (Union[Dict[str, Any], List[Dict[str, Any]]]): The data to export.
+            output_path (str): The path where to save the CSV file.
+            delimiter (str, optional): The delimiter to use. Default is ','.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            logger.error("pyarrow is required for export_with_arrow")
+            raise ImportError("pyarrow is required for export_with_arrow")
+        
+        # Convert single dict to list
+        if isinstance(data, dict):
+            data = [data]
+        
+        if len(data) < _ARROW_MIN_ROWS:
+            self.export(data, output_path, delimiter=delimiter)
+            return
+        
+        # Ensure directory exists
+        _ensure_dir(output_path)
+        
+        try:
+            nested_types = (list, dict)
+            columns = {}
+            for name in _collect_fieldnames(data):
+                values = [item.get(name) for item in data]
+                values = [str(value) if isinstance(value, nested_types) else value for value in values]
+                try:
+                    columns[name] = pa.array(values)
+                except pa.ArrowException:
+                    # Mixed value types in a column are written as strings
+                    columns[name] = pa.array([None if value is None else str(value) for value in values])
+            
+            pa_csv.write_csv(
+                pa.table(columns), output_path,
+                write_options=pa_csv.WriteOptions(
+                    delimiter=delimiter, quoting_style="needed", quoting_header="needed"
+                )
+            )
+            
+            logger.info("Data exported to CSV file using pyarrow: %s", output_path)
+        except Exception as e:
+            logger.error("Error exporting data to CSV file using pyarrow: %s", e)
             raise
     
     def export_compressed(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str,
@@ -136,10 +225,8 @@ class CSVExporter(BaseExporter):
             quotechar (str, optional): The quote character to use. Default is '"'.
             encoding (str, optional): The encoding to use. Default is 'utf-8'.
         """
-        import gzip
-        
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         # Convert single dict to list
         if isinstance(data, dict):
@@ -148,42 +235,26 @@ class CSVExporter(BaseExporter):
         # Check if data is empty
         if not data:
             logger.warning("No data to export")
-            with gzip.open(output_path, 'wt', encoding=encoding, newline='') as f:
+            with _open_gzip(output_path, 'wt', encoding=encoding, newline='') as f:
                 f.write("")
             return
         
         try:
-            # Get fieldnames from the first item
-            fieldnames = list(data[0].keys())
-            
-            # Add any additional fields from other items
-            for item in data[1:]:
-                for key in item.keys():
-                    if key not in fieldnames:
-                        fieldnames.append(key)
+            # Get fieldnames from all items, in first-seen order
+            fieldnames = _collect_fieldnames(data)
             
-            with gzip.open(output_path, 'wt', encoding=encoding, newline='') as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=fieldnames, delimiter=delimiter, quotechar=quotechar,
-                    quoting=csv.QUOTE_MINIMAL
+            with _open_gzip(output_path, 'wt', encoding=encoding, newline='') as f:
+                writer = csv.writer(
+                    f, delimiter=delimiter, quotechar=quotechar, quoting=csv.QUOTE_MINIMAL
                 )
                 
                 # Write header
-                writer.writeheader()
+                writer.writerow(fieldnames)
                 
-                # Write data
-                for item in data:
-                    # Convert any non-string values to strings
-                    row = {}
-                    for key, value in item.items():
-                        if isinstance(value, (list, dict)):
-                            row[key] = str(value)
-                        else:
-                            row[key] = value
-                    
-                    writer.writerow(row)
+                # Write data, converting list and dict values to strings
+                writer.writerows(_iter_rows(data, fieldnames))
             
-            logger.info(f"Data exported to compressed CSV file: {output_path}")
+            logger.info("Data exported to compressed CSV file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to compressed CSV file: {str(e)}")
+            logger.error("Error exporting data to compressed CSV file: %s", e)
             raise
\ No newline at end of file
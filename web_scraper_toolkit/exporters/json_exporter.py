@@ -4,13 +4,37 @@ JSON exporter for the Web Scraper Toolkit.
 
 import json
 import logging
-import os
-from typing import Dict, List, Any, Union
+from typing import Dict, Iterable, List, Any, Union
 
-from . import BaseExporter, register_exporter
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from . import BaseExporter, _ensure_dir, _open_gzip, register_exporter
 
 logger = logging.getLogger(__name__)
 
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when available.
+    
+    Args:
+        data (Any): The data to serialize.
+        indent (bool, optional): Whether to indent with two spaces. Default is False.
+    
+    Returns:
+        bytes: The JSON document.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            # e.g. non-string keys or integers beyond 64 bits, which the json module handles
+            pass
+    
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
 @register_exporter("json")
 class JSONExporter(BaseExporter):
     """
@@ -28,36 +52,40 @@ class JSONExporter(BaseExporter):
             output_path (str): The path where to save the JSON file.
         """
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(_dumps(data, indent=True))
             
-            logger.info(f"Data exported to JSON file: {output_path}")
+            logger.info("Data exported to JSON file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to JSON file: {str(e)}")
+            logger.error("Error exporting data to JSON file: %s", e)
             raise
 
-    def export_jsonl(self, data: List[Dict[str, Any]], output_path: str) -> None:
+    def export_jsonl(self, data: Iterable[Dict[str, Any]], output_path: str) -> None:
         """
         Export data to a JSON Lines file.
         
+        Items are written one at a time, so data can be a generator (such as
+        Scraper.scrape_iter()) that is never held in memory as a whole.
+        
         Args:
-            data (List[Dict[str, Any]]): The data to export.
+            data (Iterable[Dict[str, Any]]): The data to export.
             output_path (str): The path where to save the JSON Lines file.
         """
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with open(output_path, 'wb') as f:
                 for item in data:
-                    f.write(json.dumps(item, ensure_ascii=False) + '\n')
+                    f.write(_dumps(item))
+                    f.write(b'\n')
             
-            logger.info(f"Data exported to JSON Lines file: {output_path}")
+            logger.info("Data exported to JSON Lines file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to JSON Lines file: {str(e)}")
+            logger.error("Error exporting data to JSON Lines file: %s", e)
             raise
 
     def export_pretty(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str) -> None:
@@ -69,15 +97,15 @@ class JSONExporter(BaseExporter):
             output_path (str): The path where to save the JSON file.
         """
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4, sort_keys=True)
             
-            logger.info(f"Data exported to pretty-printed JSON file: {output_path}")
+            logger.info("Data exported to pretty-printed JSON file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to pretty-printed JSON file: {str(e)}")
+            logger.error("Error exporting data to pretty-printed JSON file: %s", e)
             raise
 
     def export_compressed(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str) -> None:
@@ -88,16 +116,14 @@ class JSONExporter(BaseExporter):
             data (Union[Dict[str, Any], List[Dict[str, Any]]]): The data to export.
             output_path (str): The path where to save the compressed JSON file.
         """
-        import gzip
-        
         # Ensure directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        _ensure_dir(output_path)
         
         try:
-            with gzip.open(output_path, 'wt', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False)
+            with _open_gzip(output_path, 'wb') as f:
+                f.write(_dumps(data))
             
-            logger.info(f"Data exported to compressed JSON file: {output_path}")
+            logger.info("Data exported to compressed JSON file: %s", output_path)
         except Exception as e:
-            logger.error(f"Error exporting data to compressed JSON file: {str(e)}")
+            logger.error("Error exporting data to compressed JSON file: %s", e)
             raise
\ No newline at end of file
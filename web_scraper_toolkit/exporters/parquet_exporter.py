@@ -0,0 +1,62 @@
+"""
+Parquet exporter for the Web Scraper Toolkit.
+"""
+
+import logging
+from typing import Dict, List, Any, Union
+
+from . import BaseExporter, _ensure_dir, register_exporter
+
+logger = logging.getLogger(__name__)
+
+@register_exporter("parquet", extensions=("parquet", "pq"))
+class ParquetExporter(BaseExporter):
+    """
+    Exporter for Parquet format.
+    
+    This exporter saves data to a columnar Parquet file using pyarrow.
+    """
+    
+    def export(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], output_path: str,
+              compression: str = 'snappy') -> None:
+        """
+        Export data to a Parquet file.
+        
+        List and dict values are stored as nested Parquet columns when all values of
+        a field have the same shape, and as strings otherwise.
+        
+        Args:
+            data (Union[Dict[str, Any], List[Dict[str, Any]]]): The data to export.
+            output_path (str): The path where to save the Parquet file.
+            compression (str, optional): The compression codec to use. Default is 'snappy'.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.error("pyarrow is required for Parquet export")
+            raise ImportError("pyarrow is required for Parquet export")
+        
+        # Ensure directory exists
+        _ensure_dir(output_path)
+        
+        # Convert single dict to list
+        if isinstance(data, dict):
+            data = [data]
+        
+        try:
+            columns = {}
+            for name in dict.fromkeys(key for item in data for key in item):
+                values = [item.get(name) for item in data]
+                try:
+                    columns[name] = pa.array(values)
+                except pa.ArrowException:
+                    # Values of mixed types are stored as strings
+                    columns[name] = pa.array([None if value is None else str(value) for value in values])
+            
+            pq.write_table(pa.table(columns), output_path, compression=compression)
+            
+            logger.info("Data exported to Parquet file: %s", output_path)
+        except Exception as e:
+            logger.error("Error exporting data to Parquet file: %s", e)
+            raise
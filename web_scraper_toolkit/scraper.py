@@ -2,16 +2,28 @@
 Core scraper class for the Web Scraper Toolkit.
 """
 
+import asyncio
 import logging
+import threading
 import time
-from typing import Dict, List, Any, Optional, Union, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union, Callable
+from urllib.parse import urlsplit
 import os
 import json
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from .config import ScraperConfig
-from .engines import get_engine
+from .engines import BaseEngine, CompiledSchema, get_engine
+from .engines.aiohttp_engine import AiohttpEngine
 from .exporters import get_exporter
 from .monitoring.logger import setup_logger
+from .utils.proxy_manager import has_only_http_proxies
 from .utils.robots_txt import RobotsTxtChecker
 
 logger = logging.getLogger(__name__)
@@ -34,8 +46,8 @@ class Scraper:
         Initialize the scraper with the specified engine and configuration.
         
         Args:
-            engine (str): The scraping engine to use. Options: "requests", "selenium", 
-                         "bs4", "scrapy", "playwright". Default is "requests".
+            engine (str): The scraping engine to use. Options: "requests", "aiohttp", "httpx",
+                         "selenium", "bs4", "scrapy", "playwright". Default is "requests".
             config (ScraperConfig, optional): Configuration for the scraper. If not provided,
                                              a default configuration will be used.
         """
@@ -47,78 +59,286 @@ class Scraper:
         if engine and engine != self.config.engine:
             self.config.engine = engine
         
-        logger.info(f"Initializing scraper with {self.config.engine} engine")
+        logger.info("Initializing scraper with %s engine", self.config.engine)
         
         # Initialize the engine
         self.engine = get_engine(self.config.engine, self.config)
         
+        # aiohttp engine for scrape_multiple(), created on first use
+        self._async_engine = None
+        
+        # Earliest time.monotonic() at which the next request to each host may start
+        self._next_request_at: Dict[str, float] = {}
+        self._delay_lock = threading.Lock()
+        
         # Initialize robots.txt checker if needed
         self.robots_checker = None
         if self.config.respect_robots_txt:
             self.robots_checker = RobotsTxtChecker(self.config.user_agent)
             logger.info("Robots.txt checking enabled")
     
-    def scrape(self, url: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    def compile_schema(self, schema: Dict[str, Any]) -> CompiledSchema:
+        """
+        Compile a schema once so it can be reused across many scrapes.
+        
+        Args:
+            schema (Dict[str, Any]): The schema defining what data to extract.
+        
+        Returns:
+            CompiledSchema: The compiled schema, accepted by scrape() and
+                            scrape_multiple() in place of the schema dict.
+        """
+        return self.engine.compile_schema(schema)
+    
+    def scrape(self, url: str, schema: Union[Dict[str, Any], CompiledSchema]) -> Dict[str, Any]:
         """
         Scrape data from a single URL using the provided schema.
         
         Args:
             url (str): The URL to scrape.
-            schema (Dict[str, Any]): The schema defining what data to extract.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract,
+                or a schema compiled with compile_schema().
                 Example:
                 {
                     "title": "h1",  # Simple selector
                     "paragraphs": "p",  # Multiple elements
                     "links": {"selector": "a", "attribute": "href"},  # With attribute
-                    "date": {"selector": ".date", "processors": [date_processor]}  # With processor
+                    "date": {"selector": ".date", "processors": [date_processor]},  # With processor
+                    "prices": {"selector": ".price", "multiple": True,
+                               "processors_batch": [clean_prices]}  # Processor called once with all values
                 }
+                Batch processors receive one value per matched element, in document
+                order, with None for elements missing the attribute, and must return
+                a value for each of them.
         
         Returns:
             Dict[str, Any]: The scraped data.
         """
-        logger.info(f"Scraping URL: {url}")
+        logger.info("Scraping URL: %s", url)
         
         # Check robots.txt if enabled
         if self.robots_checker and not self.robots_checker.can_fetch(url):
-            logger.warning(f"Robots.txt disallows scraping {url}")
+            logger.warning("Robots.txt disallows scraping %s", url)
             return {}
         
         # Apply request delay if configured
         if self.config.request_delay > 0:
-            logger.debug(f"Applying request delay of {self.config.request_delay} seconds")
-            time.sleep(self.config.request_delay)
+            self._wait_for_host(url)
         
         # Scrape the URL
         try:
             result = self.engine.scrape(url, schema)
-            logger.info(f"Successfully scraped {url}")
+            logger.info("Successfully scraped %s", url)
             return result
         except Exception as e:
-            logger.error(f"Error scraping {url}: {str(e)}")
+            logger.error("Error scraping %s: %s", url, e)
             return {}
     
-    def scrape_multiple(self, urls: List[str], schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _wait_for_host(self, url: str) -> None:
+        """
+        Wait until config.request_delay has passed since the last request to the URL's host.
+        
+        Each request books the next start time for its host, so threads space
+        out their requests to a host without holding a lock while they sleep,
+        and time already spent fetching counts towards the delay.
+        
+        Args:
+            url (str): The URL about to be requested.
+        """
+        host = urlsplit(url).netloc
+        with self._delay_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = start + self.config.request_delay
+        
+        delay = start - now
+        if delay > 0:
+            logger.debug("Waiting %.2f seconds before requesting %s", delay, host)
+            time.sleep(delay)
+    
+    def scrape_multiple(self, urls: List[str],
+                        schema: Union[Dict[str, Any], CompiledSchema]) -> List[Dict[str, Any]]:
         """
         Scrape data from multiple URLs using the provided schema.
         
+        When the engine can extract data from raw HTML (and any proxies are HTTP
+        proxies), the pages are fetched concurrently with aiohttp. Otherwise
+        thread-safe engines scrape them with up to config.max_workers threads,
+        and other engines one at a time.
+        
         Args:
             urls (List[str]): The URLs to scrape.
-            schema (Dict[str, Any]): The schema defining what data to extract.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
         
         Returns:
-            List[Dict[str, Any]]: The scraped data for each URL.
+            List[Dict[str, Any]]: The scraped data for each URL, in the same order as urls.
+        """
+        # Restore the order of the URLs, since results arrive as pages finish
+        scraped = sorted(self._iter_scraped(urls, schema), key=itemgetter(0))
+        results = [result for _, result in scraped]
+        
+        logger.info("Successfully scraped %s out of %s URLs", len(results), len(urls))
+        return results
+    
+    def scrape_iter(self, urls: List[str],
+                    schema: Union[Dict[str, Any], CompiledSchema]) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape data from multiple URLs, yielding each result as soon as it is ready.
+        
+        Works like scrape_multiple(), but results are yielded in the order the
+        pages finish rather than collected into a list, so a large crawl can be
+        written out with export_stream() without holding every result in memory.
+        
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Yields:
+            Dict[str, Any]: The scraped data for each URL that was scraped successfully.
+        """
+        for _, result in self._iter_scraped(urls, schema):
+            yield result
+    
+    def _iter_scraped(self, urls: List[str],
+                      schema: Union[Dict[str, Any], CompiledSchema]) -> Iterator[Tuple[int, Dict[str, Any]]]:
         """
-        logger.info(f"Scraping {len(urls)} URLs")
+        Scrape multiple URLs, yielding successful results in completion order.
         
-        results = []
-        for url in urls:
-            result = self.scrape(url, schema)
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Yields:
+            Tuple[int, Dict[str, Any]]: The index of the URL in urls and its scraped data,
+                                        with the URL added under "url".
+        """
+        logger.info("Scraping %s URLs", len(urls))
+        
+        if self._can_scrape_async():
+            scraped = self._scrape_async(urls, schema)
+        elif self.engine.thread_safe and self.config.max_workers > 1:
+            scraped = self._scrape_threaded(urls, schema)
+        else:
+            scraped = ((index, self.scrape(url, schema)) for index, url in enumerate(urls))
+        
+        for index, result in scraped:
             if result:
-                result["url"] = url  # Add the URL to the result
-                results.append(result)
+                result["url"] = urls[index]  # Add the URL to the result
+                yield index, result
+    
+    def _can_scrape_async(self) -> bool:
+        """
+        Check whether multiple URLs can be fetched concurrently.
         
-        logger.info(f"Successfully scraped {len(results)} out of {len(urls)} URLs")
-        return results
+        Returns:
+            bool: True if the engine can extract data from raw HTML, any proxies
+                  used are HTTP proxies and no event loop is already running in
+                  this thread, False otherwise.
+        """
+        if type(self.engine).extract is BaseEngine.extract:
+            return False
+        
+        # aiohttp only supports HTTP proxies, so SOCKS proxies are used from threads
+        if self.config.use_proxies and not has_only_http_proxies(self.config.proxy_list_path):
+            logger.debug("Non-HTTP proxies configured, not scraping URLs with aiohttp")
+            return False
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        
+        # Event loops cannot be nested (e.g. inside Jupyter/Colab)
+        logger.debug("Event loop already running, scraping URLs sequentially")
+        return False
+    
+    def _scrape_async(self, urls: List[str],
+                      schema: Union[Dict[str, Any], CompiledSchema]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scrape multiple URLs concurrently with aiohttp on a private event loop.
+        
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Yields:
+            Tuple[int, Dict[str, Any]]: The index of the URL in urls and its scraped data,
+                                        in completion order.
+        """
+        # Check robots.txt up front so the event loop is not blocked by it,
+        # fetching the robots.txt files of all sites in parallel first
+        if self.robots_checker:
+            self.robots_checker.prefetch(urls)
+        
+        allowed = []
+        for index, url in enumerate(urls):
+            if self.robots_checker and not self.robots_checker.can_fetch(url):
+                logger.warning("Robots.txt disallows scraping %s", url)
+                continue
+            allowed.append(index)
+        
+        # Run on uvloop when available, without changing the global event loop policy.
+        # The loop is driven one result at a time so results can be yielded as they arrive.
+        loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        scraped = self._get_async_engine().scrape_iter([urls[index] for index in allowed], schema)
+        try:
+            while True:
+                try:
+                    position, result = loop.run_until_complete(scraped.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield allowed[position], result
+        finally:
+            loop.run_until_complete(scraped.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+    
+    def _scrape_threaded(self, urls: List[str],
+                         schema: Union[Dict[str, Any], CompiledSchema]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scrape multiple URLs with a pool of worker threads.
+        
+        Different hosts are scraped in parallel, while requests to the same
+        host are spaced by the request delay.
+        
+        Args:
+            urls (List[str]): The URLs to scrape.
+            schema (Union[Dict[str, Any], CompiledSchema]): The schema defining what data to extract.
+        
+        Yields:
+            Tuple[int, Dict[str, Any]]: The index of the URL in urls and its scraped data,
+                                        in completion order.
+        """
+        schema = self.compile_schema(schema)
+        
+        def scrape_url(index: int, url: str) -> Tuple[int, Dict[str, Any]]:
+            return index, self.scrape(url, schema)
+        
+        max_workers = max(1, min(self.config.max_workers, len(urls)))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(scrape_url, index, url) for index, url in enumerate(urls)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Drop the URLs not started yet if the caller stops early
+            executor.shutdown(cancel_futures=True)
+    
+    def _get_async_engine(self) -> AiohttpEngine:
+        """
+        Get the aiohttp engine used to fetch multiple URLs concurrently.
+        
+        Returns:
+            AiohttpEngine: The scraper's engine if it is an aiohttp engine, otherwise an
+                           aiohttp engine that extracts data with the scraper's engine.
+        """
+        if isinstance(self.engine, AiohttpEngine):
+            return self.engine
+        
+        if self._async_engine is None:
+            self._async_engine = AiohttpEngine(self.config, extractor=self.engine)
+        return self._async_engine
     
     def export(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], 
               output_path: str, format: str = None) -> bool:
@@ -139,7 +359,7 @@ class Scraper:
             _, ext = os.path.splitext(output_path)
             format = ext[1:] if ext else "json"  # Default to JSON
         
-        logger.info(f"Exporting data to {format} format at {output_path}")
+        logger.info("Exporting data to %s format at %s", format, output_path)
         
         # Get the appropriate exporter
         exporter = get_exporter(format)
@@ -147,10 +367,34 @@ class Scraper:
         # Export the data
         try:
             exporter.export(data, output_path)
-            logger.info(f"Successfully exported data to {output_path}")
+            logger.info("Successfully exported data to %s", output_path)
+            return True
+        except Exception as e:
+            logger.error("Error exporting data: %s", e)
+            return False
+    
+    def export_stream(self, results: Iterable[Dict[str, Any]], output_path: str) -> bool:
+        """
+        Export results to a JSON Lines file as they are produced.
+        
+        Each result is written as soon as it is received, so results from
+        scrape_iter() are never all held in memory at once.
+        
+        Args:
+            results (Iterable[Dict[str, Any]]): The results to export, e.g. from scrape_iter().
+            output_path (str): The path where to save the JSON Lines file.
+        
+        Returns:
+            bool: True if the export was successful, False otherwise.
+        """
+        logger.info("Streaming data to JSON Lines file at %s", output_path)
+        
+        try:
+            get_exporter("json").export_jsonl(results, output_path)
+            logger.info("Successfully exported data to %s", output_path)
             return True
         except Exception as e:
-            logger.error(f"Error exporting data: {str(e)}")
+            logger.error("Error exporting data: %s", e)
             return False
     
     def close(self):
@@ -5,11 +5,34 @@ Utility functions for the Web Scraper Toolkit.
 import logging
 import os
 import random
+import threading
 import time
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union
+from urllib.parse import urlsplit
+
+import validators
 
 logger = logging.getLogger(__name__)
 
+# Per-thread state for _rng
+_thread_local = threading.local()
+
+def _rng() -> random.Random:
+    """
+    Get the random number generator of the current thread.
+    
+    Each thread seeds its own generator (from os.urandom), so threads picking
+    proxies or user agents at random do not share the state of the global one.
+    
+    Returns:
+        random.Random: The random number generator of the current thread.
+    """
+    rng = getattr(_thread_local, "rng", None)
+    if rng is None:
+        rng = _thread_local.rng = random.Random()
+    return rng
+
 def ensure_dir_exists(directory: str) -> None:
     """
     Ensure that a directory exists, creating it if necessary.
@@ -19,7 +42,7 @@ def ensure_dir_exists(directory: str) -> None:
     """
     if not os.path.exists(directory):
         os.makedirs(directory)
-        logger.debug(f"Created directory: {directory}")
+        logger.debug("Created directory: %s", directory)
 
 def random_delay(min_seconds: float = 1.0, max_seconds: float = 5.0) -> None:
     """
@@ -30,7 +53,7 @@ def random_delay(min_seconds: float = 1.0, max_seconds: float = 5.0) -> None:
         max_seconds (float): Maximum sleep time in seconds.
     """
     delay = random.uniform(min_seconds, max_seconds)
-    logger.debug(f"Sleeping for {delay:.2f} seconds")
+    logger.debug("Sleeping for %.2f seconds", delay)
     time.sleep(delay)
 
 def clean_text(text: str) -> str:
@@ -46,36 +69,36 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Replace multiple whitespace with a single space
-    text = " ".join(text.split())
-    
-    return text.strip()
+    # Replace multiple whitespace with a single space; splitting also drops
+    # leading and trailing whitespace, so no separate strip() is needed
+    return " ".join(text.split())
 
+@lru_cache(maxsize=8192)
 def extract_domain(url: str) -> str:
     """
     Extract the domain from a URL.
     
+    Results are cached, since crawls look up the same URLs repeatedly.
+    
     Args:
         url (str): The URL.
     
     Returns:
         str: The domain.
     """
-    from urllib.parse import urlparse
-    
-    parsed_url = urlparse(url)
-    return parsed_url.netloc
+    return urlsplit(url).netloc
 
+@lru_cache(maxsize=8192)
 def is_valid_url(url: str) -> bool:
     """
     Check if a URL is valid.
     
+    Results are cached, since crawls look up the same URLs repeatedly.
+    
     Args:
         url (str): The URL to check.
     
     Returns:
         bool: True if the URL is valid, False otherwise.
     """
-    import validators
-    
     return validators.url(url) is True
\ No newline at end of file
@@ -2,60 +2,335 @@
 Proxy management for the Web Scraper Toolkit.
 """
 
+import asyncio
+import itertools
 import logging
-import random
 import os
+import socket
 import time
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Iterator, List, NamedTuple, Optional, Dict, Any, Set, Tuple
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from threading import Lock
+from urllib.parse import urlsplit
+
+from . import _rng
 
 logger = logging.getLogger(__name__)
 
-# Cache for proxies
+# Cache for proxies: all the proxies of the file, and the ones handed out
+# (only the working ones after refresh_proxies)
+_proxies_all: Optional[List[str]] = None
 _proxies_cache: Optional[List[str]] = None
 _proxies_lock = Lock()
-_current_proxy_index = 0
+
+# Modification time of the proxy file when the cache was loaded or last written,
+# and when the file was last checked for changes made by other processes
+_proxies_mtime_ns: Optional[int] = None
+_proxies_checked_at = 0.0
+
+# Minimum time in seconds between checks of the proxy file for changes
+_PROXY_FILE_CHECK_INTERVAL = 1.0
+
+# All the proxies of the file as a set, for membership checks that do not scan the list
+_proxies_set: Set[str] = set()
+
+# Round-robin iterator over the cached proxies, rebuilt whenever the cache changes;
+# next() on it is atomic, so proxies are handed out without taking the lock
+_proxy_cycle: Iterator[str] = iter(())
+
+class _ProxyHealth(NamedTuple):
+    """
+    Results of the tests of a proxy.
+    """
+    successes: int
+    failures: int  # Consecutive failures since the last success
+    checked_at: float
+    latency: Optional[float]  # Smoothed response time in seconds
+
+# Test results of the proxies of the file, by proxy
+_proxy_health: Dict[str, _ProxyHealth] = {}
+
+# Proxies that failed this many tests in a row are not tested again by
+# refresh_proxies until _PROXY_RETRY_AFTER seconds after their last test
+_PROXY_MAX_FAILURES = 3
+_PROXY_RETRY_AFTER = 600
+
+# Weight of the latest response time in the smoothed latency of a proxy
+_LATENCY_SMOOTHING = 0.3
+
+# Response time assumed for proxies that were never tested
+_DEFAULT_LATENCY = 1.0
+
+# The cached proxies with cumulative weights for the "weighted" rotation policy,
+# built on first use after the cache or the test results change
+_weighted_proxies: Optional[Tuple[List[str], List[float]]] = None
+
+# Lightweight page used to check that a proxy forwards requests: plain HTTP
+# (no TLS handshake through the proxy) and an empty response
+DEFAULT_PROBE_URL = "http://www.gstatic.com/generate_204"
+
+# Status codes of a successful proxy check
+_PROBE_OK_STATUSES = (200, 204)
+
+# Ports assumed for proxies given without one, by scheme
+_DEFAULT_PROXY_PORTS = {"http": 80, "https": 443, "socks4": 1080, "socks5": 1080, "socks5h": 1080}
+
+# Write buffer for the proxy file, so rewriting a long list takes few write calls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Session shared by proxy checks, so connections (and TLS sessions) to each
+# proxy are kept alive and reused across checks instead of set up every time
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# Thread pool for proxy tests, kept across calls so periodic refreshes do not
+# start and stop their threads every time
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_size = 0
+_io_pool_lock = Lock()
+
+# Maximum number of threads of the pool, whatever max_workers is asked for
+_IO_POOL_MAX_WORKERS = 32
+
+def _get_io_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool for proxy tests, creating it if needed.
+    
+    Args:
+        max_workers (int): Number of worker threads needed.
+    
+    Returns:
+        ThreadPoolExecutor: A pool with at least max_workers threads, up to _IO_POOL_MAX_WORKERS.
+    """
+    global _io_pool, _io_pool_size
+    
+    max_workers = max(1, min(max_workers, _IO_POOL_MAX_WORKERS))
+    with _io_pool_lock:
+        if _io_pool is None or _io_pool_size < max_workers:
+            # Replace a pool that is too small; tests already submitted to it still run
+            if _io_pool is not None:
+                _io_pool.shutdown(wait=False)
+            _io_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proxytest")
+            _io_pool_size = max_workers
+        return _io_pool
+
+def _set_proxies_all(proxies: List[str]) -> None:
+    """
+    Replace the cached proxies of the file, and forget the test results of the
+    proxies no longer in it.
+    
+    Must be called with _proxies_lock held.
+    
+    Args:
+        proxies (List[str]): All the proxies of the file.
+    """
+    global _proxies_all, _proxies_set
+    
+    _proxies_all = proxies
+    _proxies_set = set(proxies)
+    for proxy in [proxy for proxy in _proxy_health if proxy not in _proxies_set]:
+        del _proxy_health[proxy]
+
+def _set_proxies_cache(proxies: List[str]) -> None:
+    """
+    Replace the proxies handed out and the round-robin rotation over them.
+    
+    Must be called with _proxies_lock held.
+    
+    Args:
+        proxies (List[str]): The proxies to hand out.
+    """
+    global _proxies_cache, _proxy_cycle, _weighted_proxies
+    
+    _proxies_cache = proxies
+    _proxy_cycle = itertools.cycle(proxies)
+    _weighted_proxies = None
+
+def _latency_of(proxy: str) -> float:
+    """
+    Get the smoothed response time of a proxy.
+    
+    Args:
+        proxy (str): The proxy.
+    
+    Returns:
+        float: The response time in seconds, or _DEFAULT_LATENCY if unknown.
+    """
+    health = _proxy_health.get(proxy)
+    if health is None or health.latency is None:
+        return _DEFAULT_LATENCY
+    return health.latency
+
+def _get_weighted_proxies() -> Tuple[List[str], List[float]]:
+    """
+    Get the cached proxies with cumulative weights favouring fast proxies.
+    
+    Returns:
+        Tuple[List[str], List[float]]: The proxies and their cumulative weights, each
+                                       proxy weighing the inverse of its latency in
+                                       milliseconds plus one.
+    """
+    global _weighted_proxies
+    
+    with _proxies_lock:
+        if _weighted_proxies is None:
+            proxies = list(_proxies_cache or [])
+            cum_weights = list(itertools.accumulate(
+                1.0 / (_latency_of(proxy) * 1000 + 1) for proxy in proxies
+            ))
+            _weighted_proxies = (proxies, cum_weights)
+        return _weighted_proxies
+
+def _record_results(results: Dict[str, Optional[float]]) -> None:
+    """
+    Update the health of tested proxies.
+    
+    Only proxies of the proxy file are tracked, so testing other proxies
+    with filter_working_proxies() does not grow the health records.
+    
+    Args:
+        results (Dict[str, Optional[float]]): The response time in seconds of each
+                                              tested proxy, or None if it failed.
+    """
+    global _weighted_proxies
+    
+    now = time.time()
+    with _proxies_lock:
+        for proxy, latency in results.items():
+            if proxy not in _proxies_set:
+                continue
+            
+            health = _proxy_health.get(proxy)
+            if health is None:
+                health = _ProxyHealth(0, 0, now, None)
+            
+            if latency is None:
+                health = health._replace(failures=health.failures + 1, checked_at=now)
+            else:
+                if health.latency is not None:
+                    latency = health.latency + _LATENCY_SMOOTHING * (latency - health.latency)
+                health = _ProxyHealth(health.successes + 1, 0, now, latency)
+            _proxy_health[proxy] = health
+        
+        _weighted_proxies = None
+
+def _is_failing(proxy: str, now: float) -> bool:
+    """
+    Check whether a proxy failed too many tests in a row to be tested again yet.
+    
+    Must be called with _proxies_lock held.
+    
+    Args:
+        proxy (str): The proxy.
+        now (float): The current time.
+    
+    Returns:
+        bool: True if the proxy should be skipped, False otherwise.
+    """
+    health = _proxy_health.get(proxy)
+    return (health is not None and health.failures >= _PROXY_MAX_FAILURES
+            and now - health.checked_at < _PROXY_RETRY_AFTER)
+
+def _is_http_proxy(proxy: str) -> bool:
+    """
+    Check whether a proxy can be used by aiohttp, which only supports HTTP proxies.
+    
+    Args:
+        proxy (str): The proxy, with or without a scheme.
+    
+    Returns:
+        bool: True if the proxy is an HTTP proxy (proxies without a scheme are).
+    """
+    return "://" not in proxy or proxy.split("://", 1)[0].lower() == "http"
+
+def _record_mtime(file_path: str) -> None:
+    """
+    Remember the modification time of the proxy file after writing to it, so
+    the change is not mistaken for one made by another process.
+    
+    Must be called with _proxies_lock held.
+    
+    Args:
+        file_path (str): Path to the file containing proxies.
+    """
+    global _proxies_mtime_ns
+    
+    try:
+        _proxies_mtime_ns = os.stat(file_path).st_mtime_ns
+    except OSError:
+        _proxies_mtime_ns = None
 
 def _load_proxies(file_path: str) -> List[str]:
     """
     Load proxies from a file.
     
+    Once loaded, proxies are served from the cache. The file is reloaded when
+    its modification time changes (checked at most every
+    _PROXY_FILE_CHECK_INTERVAL seconds), e.g. when another process edits it.
+    
     Args:
         file_path (str): Path to the file containing proxies.
     
     Returns:
         List[str]: List of proxies.
     """
-    global _proxies_cache
+    global _proxies_mtime_ns, _proxies_checked_at
+    
+    # Return cached proxies if checked recently, without locking
+    proxies_cache = _proxies_cache
+    if proxies_cache is not None and time.monotonic() - _proxies_checked_at < _PROXY_FILE_CHECK_INTERVAL:
+        return proxies_cache
     
     with _proxies_lock:
-        # Return cached proxies if available
         if _proxies_cache is not None:
-            return _proxies_cache
-        
-        # Check if file exists
-        if not os.path.exists(file_path):
-            logger.warning(f"Proxy file not found: {file_path}")
-            return []
+            # Another thread may have checked the file while we waited for the lock
+            now = time.monotonic()
+            if now - _proxies_checked_at < _PROXY_FILE_CHECK_INTERVAL:
+                return _proxies_cache
+            _proxies_checked_at = now
+            
+            # Keep the cached proxies while the file is unchanged (or gone)
+            try:
+                mtime_ns = os.stat(file_path).st_mtime_ns
+            except OSError:
+                return _proxies_cache
+            if mtime_ns == _proxies_mtime_ns:
+                return _proxies_cache
+            
+            logger.info("Proxy file %s changed, reloading it", file_path)
         
         # Load proxies from file
         try:
+            # Read the whole file at once rather than line by line
             with open(file_path, "r") as f:
-                proxies = [line.strip() for line in f if line.strip()]
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                lines = f.read().splitlines()
+            proxies = [line for line in map(str.strip, lines) if line]
             
-            if not proxies:
-                logger.warning(f"No proxies found in {file_path}")
-                return []
+            # Cache proxies, with the file version they were read from
+            _set_proxies_all(proxies)
+            _set_proxies_cache(proxies)
+            _proxies_mtime_ns = mtime_ns
+            _proxies_checked_at = time.monotonic()
             
-            # Cache proxies
-            _proxies_cache = proxies
+            if not proxies:
+                logger.warning("No proxies found in %s", file_path)
+                return proxies
             
-            logger.info(f"Loaded {len(proxies)} proxies from {file_path}")
+            logger.info("Loaded %s proxies from %s", len(proxies), file_path)
             return proxies
+        except (FileNotFoundError, PermissionError) as e:
+            # Keep serving the cached proxies if the file cannot be reloaded
+            logger.warning("Cannot read proxy file %s: %s", file_path, e)
+            return _proxies_cache if _proxies_cache is not None else []
         except Exception as e:
-            logger.error(f"Error loading proxies from {file_path}: {str(e)}")
-            return []
+            logger.error("Error loading proxies from %s: %s", file_path, e)
+            return _proxies_cache if _proxies_cache is not None else []
 
 def get_proxy(file_path: str, rotation_policy: str = "round-robin") -> Optional[str]:
     """
@@ -63,13 +338,12 @@ def get_proxy(file_path: str, rotation_policy: str = "round-robin") -> Optional[
     
     Args:
         file_path (str): Path to the file containing proxies.
-        rotation_policy (str): The proxy rotation policy. Options: "round-robin", "random".
+        rotation_policy (str): The proxy rotation policy. Options: "round-robin", "random",
+                               "weighted" (random, favouring proxies with lower latency).
     
     Returns:
         Optional[str]: A proxy, or None if no proxies are available.
     """
-    global _current_proxy_index
-    
     # Load proxies
     proxies = _load_proxies(file_path)
     
@@ -77,106 +351,328 @@ def get_proxy(file_path: str, rotation_policy: str = "round-robin") -> Optional[
         return None
     
     # Get proxy based on rotation policy
-    with _proxies_lock:
-        if rotation_policy == "random":
-            return random.choice(proxies)
-        elif rotation_policy == "round-robin":
-            proxy = proxies[_current_proxy_index]
-            _current_proxy_index = (_current_proxy_index + 1) % len(proxies)
-            return proxy
-        else:
-            logger.warning(f"Unknown proxy rotation policy: {rotation_policy}")
-            return random.choice(proxies)
+    if rotation_policy == "random":
+        return _rng().choice(proxies)
+    elif rotation_policy == "round-robin":
+        # None if the cache was emptied by a refresh in the meantime
+        return next(_proxy_cycle, None)
+    elif rotation_policy == "weighted":
+        weighted, cum_weights = _get_weighted_proxies()
+        if not weighted:
+            return None
+        return _rng().choices(weighted, cum_weights=cum_weights)[0]
+    else:
+        logger.warning("Unknown proxy rotation policy: %s", rotation_policy)
+        return _rng().choice(proxies)
 
-def test_proxy(proxy: str, timeout: int = 5) -> bool:
+def has_only_http_proxies(file_path: str) -> bool:
+    """
+    Check whether all the proxies handed out from a file are HTTP proxies.
+    
+    Args:
+        file_path (str): Path to the file containing proxies.
+    
+    Returns:
+        bool: True if no proxy needs another protocol (e.g. SOCKS), False otherwise.
+    """
+    return all(_is_http_proxy(proxy) for proxy in _load_proxies(file_path))
+
+def test_proxy(proxy: str, timeout: int = 5, probe_url: str = DEFAULT_PROBE_URL) -> bool:
     """
     Test if a proxy is working.
     
     Args:
         proxy (str): The proxy to test.
         timeout (int): Timeout in seconds.
+        probe_url (str): The URL requested (with HEAD) through the proxy. Use an
+                         https:// URL to also check that the proxy tunnels TLS.
     
     Returns:
         bool: True if the proxy is working, False otherwise.
     """
+    return _probe_proxy(proxy, timeout, probe_url) is not None
+
+def test_proxy_tcp(proxy: str, timeout: int = 5) -> bool:
+    """
+    Test if a proxy accepts connections, without sending a request through it.
+    
+    This only checks that the proxy is reachable, not that it forwards requests.
+    
+    Args:
+        proxy (str): The proxy to test.
+        timeout (int): Timeout in seconds.
+    
+    Returns:
+        bool: True if a TCP connection to the proxy could be opened, False otherwise.
+    """
+    parsed = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    try:
+        port = parsed.port or _DEFAULT_PROXY_PORTS.get(parsed.scheme.lower())
+        if not parsed.hostname or not port:
+            # Without a host, the connection would go to localhost
+            logger.warning("Proxy %s has no host or port", proxy)
+            return False
+        
+        with socket.create_connection((parsed.hostname, port), timeout=timeout):
+            return True
+    except (OSError, ValueError) as e:
+        logger.warning("Proxy %s is not reachable: %s", proxy, e)
+        return False
+
+def _probe_proxy(proxy: str, timeout: int, probe_url: str = DEFAULT_PROBE_URL) -> Optional[float]:
+    """
+    Test if a proxy is working and measure its response time.
+    
+    Args:
+        proxy (str): The proxy to test.
+        timeout (int): Timeout in seconds.
+        probe_url (str): The URL requested through the proxy.
+    
+    Returns:
+        Optional[float]: The response time in seconds, or None if the proxy is not working.
+    """
+    start = time.monotonic()
     try:
-        # Test proxy with a request to a reliable service
-        response = requests.get(
-            "https://httpbin.org/ip",
+        # Test proxy with a request that has no response body
+        response = _session.head(
+            probe_url,
             proxies={"http": proxy, "https": proxy},
-            timeout=timeout
+            timeout=timeout,
+            allow_redirects=False
         )
         
         # Check if the response is valid
-        if response.status_code == 200:
-            return True
+        if response.status_code in _PROBE_OK_STATUSES:
+            return time.monotonic() - start
         else:
-            logger.warning(f"Proxy {proxy} returned status code {response.status_code}")
-            return False
+            logger.warning("Proxy %s returned status code %s", proxy, response.status_code)
+            return None
     except Exception as e:
-        logger.warning(f"Proxy {proxy} test failed: {str(e)}")
-        return False
+        logger.warning("Proxy %s test failed: %s", proxy, e)
+        return None
 
-def filter_working_proxies(proxies: List[str], timeout: int = 5, max_workers: int = 10) -> List[str]:
+async def _atest_proxy(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                       proxy: str, timeout: int, probe_url: str) -> Optional[float]:
     """
-    Filter out non-working proxies.
+    Test if a proxy is working and measure its response time, on an event loop.
+    
+    Args:
+        session (aiohttp.ClientSession): The session to send the request with.
+        semaphore (asyncio.Semaphore): Limits the number of proxies tested at once.
+        proxy (str): The proxy to test.
+        timeout (int): Timeout in seconds.
+        probe_url (str): The URL requested through the proxy.
+    
+    Returns:
+        Optional[float]: The response time in seconds, or None if the proxy is not working.
+    """
+    # requests assumes http:// for proxies given as host:port, aiohttp needs the scheme
+    proxy_url = proxy if "://" in proxy else f"http://{proxy}"
+    
+    async with semaphore:
+        start = time.monotonic()
+        try:
+            async with session.head(
+                probe_url,
+                proxy=proxy_url,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                allow_redirects=False
+            ) as response:
+                # Check if the response is valid
+                if response.status in _PROBE_OK_STATUSES:
+                    return time.monotonic() - start
+                else:
+                    logger.warning("Proxy %s returned status code %s", proxy, response.status)
+                    return None
+        except Exception as e:
+            logger.warning("Proxy %s test failed: %s", proxy, e)
+            return None
+
+async def _atest_proxies(proxies: List[str], timeout: int, max_workers: int,
+                         overall_timeout: Optional[float], probe_url: str) -> Dict[str, Optional[float]]:
+    """
+    Test proxies concurrently on an event loop.
     
     Args:
         proxies (List[str]): List of proxies to test.
         timeout (int): Timeout in seconds for each proxy test.
-        max_workers (int): Maximum number of concurrent workers.
+        max_workers (int): Maximum number of proxies tested at once.
+        overall_timeout (float, optional): Maximum time in seconds to wait for all tests.
+        probe_url (str): The URL requested through each proxy.
     
     Returns:
-        List[str]: List of working proxies.
+        Dict[str, Optional[float]]: The response time in seconds of each tested proxy,
+                                    or None if it is not working. Proxies left untested
+                                    after the overall timeout are missing.
     """
-    from concurrent.futures import ThreadPoolExecutor
+    semaphore = asyncio.Semaphore(max_workers)
+    connector = aiohttp.TCPConnector(limit=max_workers)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = {
+            asyncio.ensure_future(_atest_proxy(session, semaphore, proxy, timeout, probe_url)): proxy
+            for proxy in proxies
+        }
+        done, pending = await asyncio.wait(tasks, timeout=overall_timeout)
+        
+        if pending:
+            logger.warning("Proxy testing timed out after %s seconds, %s proxies untested",
+                           overall_timeout, len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return {tasks[task]: task.result() for task in done}
+
+def _test_proxies_threaded(proxies: List[str], timeout: int, max_workers: int,
+                           overall_timeout: Optional[float], probe_url: str) -> Dict[str, Optional[float]]:
+    """
+    Test proxies concurrently on the shared pool of worker threads.
+    
+    Args:
+        proxies (List[str]): List of proxies to test.
+        timeout (int): Timeout in seconds for each proxy test.
+        max_workers (int): Maximum number of proxies tested at once.
+        overall_timeout (float, optional): Maximum time in seconds to wait for all tests.
+        probe_url (str): The URL requested through each proxy.
     
-    logger.info(f"Testing {len(proxies)} proxies...")
+    Returns:
+        Dict[str, Optional[float]]: The response time in seconds of each tested proxy,
+                                    or None if it is not working. Proxies left untested
+                                    after the overall timeout are missing.
+    """
+    results = {}
     
-    working_proxies = []
+    # Submit all proxy tests
+    executor = _get_io_pool(max_workers)
+    future_to_proxy = {executor.submit(_probe_proxy, proxy, timeout, probe_url): proxy for proxy in proxies}
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all proxy tests
-        future_to_proxy = {executor.submit(test_proxy, proxy, timeout): proxy for proxy in proxies}
-        
+    try:
         # Process results as they complete
+        try:
+            for future in as_completed(future_to_proxy, timeout=overall_timeout):
+                proxy = future_to_proxy[future]
+                try:
+                    results[proxy] = future.result()
+                except Exception as e:
+                    logger.error("Error testing proxy %s: %s", proxy, e)
+                    results[proxy] = None
+        except TimeoutError:
+            pending = sum(1 for future in future_to_proxy if not future.done())
+            logger.warning("Proxy testing timed out after %s seconds, %s proxies untested",
+                           overall_timeout, pending)
+    finally:
+        # Drop the tests not started yet after a timeout, without waiting for running ones
         for future in future_to_proxy:
-            proxy = future_to_proxy[future]
-            try:
-                if future.result():
-                    working_proxies.append(proxy)
-            except Exception as e:
-                logger.error(f"Error testing proxy {proxy}: {str(e)}")
+            future.cancel()
+    
+    return results
+
+def filter_working_proxies(proxies: List[str], timeout: int = 5, max_workers: int = 100,
+                           overall_timeout: Optional[float] = None,
+                           probe_url: str = DEFAULT_PROBE_URL) -> List[str]:
+    """
+    Filter out non-working proxies.
+    
+    HTTP proxies are tested concurrently on a single asyncio event loop with
+    aiohttp. Other proxies (e.g. SOCKS), or calls made while an event loop
+    is already running, fall back to a shared pool of at most
+    _IO_POOL_MAX_WORKERS worker threads. The results for proxies of the
+    proxy file are recorded for refresh_proxies and the "weighted" rotation
+    policy.
+    
+    Args:
+        proxies (List[str]): List of proxies to test.
+        timeout (int): Timeout in seconds for each proxy test.
+        max_workers (int): Maximum number of proxies tested at once.
+        overall_timeout (float, optional): Maximum time in seconds to wait for all tests.
+                                           Proxies not confirmed by then are treated as
+                                           not working. Default is no limit.
+        probe_url (str): The URL requested (with HEAD) through each proxy.
+    
+    Returns:
+        List[str]: List of working proxies, in their original order.
+    """
+    logger.info("Testing %s proxies...", len(proxies))
+    
+    # aiohttp only supports HTTP proxies
+    use_asyncio = all(_is_http_proxy(proxy) for proxy in proxies)
+    if use_asyncio:
+        try:
+            asyncio.get_running_loop()
+            # asyncio.run() cannot be nested (e.g. inside Jupyter/Colab)
+            use_asyncio = False
+        except RuntimeError:
+            pass
+    
+    if not proxies:
+        results = {}
+    elif use_asyncio:
+        results = asyncio.run(_atest_proxies(proxies, timeout, max_workers, overall_timeout, probe_url))
+    else:
+        results = _test_proxies_threaded(proxies, timeout, max_workers, overall_timeout, probe_url)
+    
+    _record_results(results)
+    
+    working_proxies = [proxy for proxy in proxies if results.get(proxy) is not None]
     
-    logger.info(f"Found {len(working_proxies)} working proxies out of {len(proxies)}")
+    logger.info("Found %s working proxies out of %s", len(working_proxies), len(proxies))
     
     return working_proxies
 
-def refresh_proxies(file_path: str, timeout: int = 5, max_workers: int = 10) -> None:
+def refresh_proxies(file_path: str, timeout: int = 5, max_workers: int = 100,
+                    probe_url: str = DEFAULT_PROBE_URL) -> None:
     """
-    Refresh the proxy cache by testing all proxies and updating the cache.
+    Refresh the proxy cache by testing all proxies of the file and handing out
+    only the working ones.
+    
+    Proxies that failed their last _PROXY_MAX_FAILURES tests are not tested
+    again (and not handed out) until _PROXY_RETRY_AFTER seconds after their
+    last test. If the proxy file is changed by another process, the
+    cache is reloaded from it in full.
     
     Args:
         file_path (str): Path to the file containing proxies.
         timeout (int): Timeout in seconds for each proxy test.
-        max_workers (int): Maximum number of concurrent workers.
+        max_workers (int): Maximum number of proxies tested at once.
+        probe_url (str): The URL requested (with HEAD) through each proxy.
     """
-    global _proxies_cache
+    # Load proxies, and test all of them rather than only the ones handed out
+    _load_proxies(file_path)
     
-    # Load proxies
-    proxies = _load_proxies(file_path)
+    now = time.time()
+    with _proxies_lock:
+        proxies = _proxies_all or []
+        
+        # Skip proxies that keep failing
+        to_test = [proxy for proxy in proxies if not _is_failing(proxy, now)]
     
     if not proxies:
         return
     
+    if len(to_test) < len(proxies):
+        logger.info("Skipping %s proxies that failed their last %s tests",
+                    len(proxies) - len(to_test), _PROXY_MAX_FAILURES)
+    
     # Test proxies
-    working_proxies = filter_working_proxies(proxies, timeout, max_workers)
+    working_proxies = filter_working_proxies(to_test, timeout, max_workers, probe_url=probe_url)
     
     # Update cache
     with _proxies_lock:
-        _proxies_cache = working_proxies
+        # The list is replaced on every change, so another list means the file was
+        # reloaded or edited while testing. Keep the proxies added since then (until
+        # the next refresh) and drop the removed ones, instead of losing the changes.
+        if _proxies_all is not proxies:
+            tested = set(proxies)
+            working = set(working_proxies)
+            working_proxies = [
+                proxy for proxy in (_proxies_all or []) if proxy in working or proxy not in tested
+            ]
+            logger.info("Proxy file changed while testing proxies, keeping the new ones")
+        
+        _set_proxies_cache(working_proxies)
     
-    logger.info(f"Proxy cache refreshed with {len(working_proxies)} working proxies")
+    logger.info("Proxy cache refreshed with %s working proxies", len(working_proxies))
 
 def add_proxy(file_path: str, proxy: str) -> None:
     """
@@ -186,31 +682,41 @@ def add_proxy(file_path: str, proxy: str) -> None:
         file_path (str): Path to the file containing proxies.
         proxy (str): The proxy to add.
     """
-    global _proxies_cache
+    global _proxies_all
     
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    # Check if proxy is already in the file
-    proxies = _load_proxies(file_path)
-    
-    if proxy in proxies:
-        logger.info(f"Proxy {proxy} already exists in {file_path}")
-        return
+    # Load proxies
+    _load_proxies(file_path)
     
-    # Add proxy to file
     try:
-        with open(file_path, "a") as f:
-            f.write(f"{proxy}\n")
-        
-        # Update cache
+        # Check and write under the lock, so a proxy added by several threads is written once
         with _proxies_lock:
-            if _proxies_cache is not None:
-                _proxies_cache.append(proxy)
+            if proxy in _proxies_set:
+                logger.info("Proxy %s already exists in %s", proxy, file_path)
+                return
+            
+            # Add proxy to file
+            try:
+                f = open(file_path, "a")
+            except FileNotFoundError:
+                # Create the directory only when the file cannot be created without it
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                f = open(file_path, "a")
+            
+            with f:
+                f.write(f"{proxy}\n")
+            
+            # Update cache with new lists, the cached ones may be in use by other
+            # threads. The set is only read under the lock, so it is extended in
+            # place, and no test results need pruning since nothing was removed.
+            if _proxies_all is not None:
+                _proxies_all = _proxies_all + [proxy]
+                _proxies_set.add(proxy)
+                _set_proxies_cache(_proxies_cache + [proxy])
+                _record_mtime(file_path)
         
-        logger.info(f"Added proxy {proxy} to {file_path}")
+        logger.info("Added proxy %s to %s", proxy, file_path)
     except Exception as e:
-        logger.error(f"Error adding proxy {proxy} to {file_path}: {str(e)}")
+        logger.error("Error adding proxy %s to %s: %s", proxy, file_path, e)
 
 def remove_proxy(file_path: str, proxy: str) -> None:
     """
@@ -220,32 +726,33 @@ def remove_proxy(file_path: str, proxy: str) -> None:
         file_path (str): Path to the file containing proxies.
         proxy (str): The proxy to remove.
     """
-    global _proxies_cache
-    
     # Load proxies
-    proxies = _load_proxies(file_path)
+    _load_proxies(file_path)
     
-    if proxy not in proxies:
-        logger.info(f"Proxy {proxy} not found in {file_path}")
-        return
-    
-    # Remove proxy from list
-    proxies.remove(proxy)
-    
-    # Write updated list to file
     try:
-        with open(file_path, "w") as f:
-            for p in proxies:
-                f.write(f"{p}\n")
-        
-        # Update cache
+        # Check and write under the lock, so concurrent changes to the file are not lost
         with _proxies_lock:
-            if _proxies_cache is not None:
-                _proxies_cache = proxies
+            if proxy not in _proxies_set:
+                logger.info("Proxy %s not found in %s", proxy, file_path)
+                return
+            
+            # Remove proxy from a copy of the list, the cached one may be in use by other threads
+            proxies = list(_proxies_all)
+            proxies.remove(proxy)
+            
+            # Write updated list to file
+            with open(file_path, "w", buffering=_WRITE_BUFFER_SIZE) as f:
+                if proxies:
+                    f.write("\n".join(proxies) + "\n")
+            
+            # Update cache
+            _set_proxies_all(proxies)
+            _set_proxies_cache([p for p in _proxies_cache if p != proxy])
+            _record_mtime(file_path)
         
-        logger.info(f"Removed proxy {proxy} from {file_path}")
+        logger.info("Removed proxy %s from %s", proxy, file_path)
     except Exception as e:
-        logger.error(f"Error removing proxy {proxy} from {file_path}: {str(e)}")
+        logger.error("Error removing proxy %s from %s: %s", proxy, file_path, e)
 
 def get_proxy_info(proxy: str) -> Dict[str, Any]:
     """
@@ -259,7 +766,7 @@ def get_proxy_info(proxy: str) -> Dict[str, Any]:
     """
     try:
         # Get proxy information from a service
-        response = requests.get(
+        response = _session.get(
             "https://ipinfo.io/json",
             proxies={"http": proxy, "https": proxy},
             timeout=5
@@ -268,8 +775,8 @@ def get_proxy_info(proxy: str) -> Dict[str, Any]:
         if response.status_code == 200:
             return response.json()
         else:
-            logger.warning(f"Failed to get proxy info for {proxy}: {response.status_code}")
+            logger.warning("Failed to get proxy info for %s: %s", proxy, response.status_code)
             return {}
     except Exception as e:
-        logger.warning(f"Error getting proxy info for {proxy}: {str(e)}")
+        logger.warning("Error getting proxy info for %s: %s", proxy, e)
         return {}
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Per-domain rate limiting for the Web Scraper Toolkit.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+class DomainRateLimiter:
+    """
+    Enforces a minimum delay between requests to the same host.
+    
+    Requests to different hosts do not wait for each other, so a batch that
+    spans many sites is fetched concurrently while each site still sees at
+    most one request per min_delay seconds.
+    
+    The limiter is meant to be used from a single event loop.
+    """
+    
+    def __init__(self, min_delay: float):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            min_delay (float): Minimum delay between requests to the same host, in seconds.
+        """
+        self.min_delay = min_delay
+        self._last_request: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    
+    async def wait(self, host: str) -> None:
+        """
+        Wait until a request to the host is allowed.
+        
+        Args:
+            host (str): The host (network location) about to be requested.
+        """
+        if self.min_delay <= 0:
+            return
+        
+        # Requests to the same host queue up on its lock and go out one by one
+        async with self._locks[host]:
+            loop = asyncio.get_running_loop()
+            last_request = self._last_request.get(host)
+            if last_request is not None:
+                delay = self.min_delay - (loop.time() - last_request)
+                if delay > 0:
+                    logger.debug("Waiting %.2f seconds before requesting %s", delay, host)
+                    await asyncio.sleep(delay)
+            
+            self._last_request[host] = loop.time()
@@ -5,18 +5,174 @@ Robots.txt handling for the Web Scraper Toolkit.
 import logging
 import urllib.robotparser
 import urllib.parse
-from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
 from threading import Lock
 import time
+import requests
 
 logger = logging.getLogger(__name__)
 
-# Cache for robots.txt parsers
-_robots_parsers: Dict[str, urllib.robotparser.RobotFileParser] = {}
+# Timeout in seconds for fetching a robots.txt file
+_ROBOTS_TIMEOUT = 10
+
+# Session shared by robots.txt fetches, so connections are kept alive and
+# responses are compressed
+_session = requests.Session()
+
+class _RobotsEntry(NamedTuple):
+    """
+    A cached robots.txt parser with the validators of the response it was built from.
+    
+    The parser is None when robots.txt could not be fetched, so that failures
+    are cached too (for a shorter time) instead of retried on every call.
+    """
+    parser: Optional[urllib.robotparser.RobotFileParser]
+    fetched_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+    ttl: float
+
+# LRU cache of robots.txt entries by base URL, least recently used first
+_robots_cache: "OrderedDict[str, _RobotsEntry]" = OrderedDict()
 _robots_parsers_lock = Lock()
-_robots_parsers_last_used: Dict[str, float] = {}
 _robots_parsers_max_cache_size = 100
 _robots_parsers_cache_ttl = 3600  # 1 hour
+_robots_failures_cache_ttl = 300  # 5 minutes
+
+# Locks of the sites whose robots.txt is being fetched, so each site is fetched
+# once at a time while different sites are fetched in parallel
+_robots_fetch_locks: Dict[str, Lock] = {}
+
+def _fetch_robots(base_url: str, cached: Optional[_RobotsEntry] = None) -> _RobotsEntry:
+    """
+    Fetch and parse the robots.txt file of a site.
+    
+    Status codes are handled like RobotFileParser.read() does: 401 and 403
+    disallow everything, other 4xx allow everything and 5xx disallow
+    everything. When a previous entry is given, the request is conditional
+    and a 304 response keeps its parser.
+    
+    Args:
+        base_url (str): The base URL (scheme + netloc).
+        cached (_RobotsEntry, optional): The expired cache entry for the site, if any.
+    
+    Returns:
+        _RobotsEntry: The cache entry for the site.
+    
+    Raises:
+        requests.RequestException: If robots.txt cannot be fetched.
+    """
+    robots_url = f"{base_url}/robots.txt"
+    
+    # Revalidate the cached copy instead of downloading it again
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    
+    response = _session.get(robots_url, headers=headers, timeout=_ROBOTS_TIMEOUT)
+    
+    if response.status_code == 304 and cached is not None:
+        return cached._replace(fetched_at=time.time())
+    
+    parser = urllib.robotparser.RobotFileParser(robots_url)
+    if response.status_code in (401, 403):
+        parser.disallow_all = True
+    elif 400 <= response.status_code < 500:
+        parser.allow_all = True
+    elif response.status_code < 500:
+        parser.parse(response.content.decode("utf-8", errors="replace").splitlines())
+    # On server errors the parser is left unread, so it allows nothing
+    
+    return _RobotsEntry(
+        parser,
+        time.time(),
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+        _robots_parsers_cache_ttl
+    )
+
+@lru_cache(maxsize=4096)
+def _split_url(url: str) -> Tuple[str, str]:
+    """
+    Split a URL into its base URL and the path checked against robots.txt.
+    
+    Args:
+        url (str): The URL.
+    
+    Returns:
+        Tuple[str, str]: The base URL (scheme + netloc) and the path ("/" if empty).
+    """
+    parsed_url = urllib.parse.urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}", parsed_url.path or "/"
+
+def _is_fresh(entry: Optional[_RobotsEntry]) -> bool:
+    """
+    Check whether a cache entry can be used without fetching robots.txt again.
+    
+    Args:
+        entry (_RobotsEntry, optional): The cache entry.
+    
+    Returns:
+        bool: True if the entry exists and has not expired, False otherwise.
+    """
+    return entry is not None and time.time() - entry.fetched_at <= entry.ttl
+
+def _load_parser(base_url: str) -> Optional[urllib.robotparser.RobotFileParser]:
+    """
+    Get the robots.txt parser for a base URL, from the cache when possible.
+    
+    Args:
+        base_url (str): The base URL (scheme + netloc).
+    
+    Returns:
+        Optional[urllib.robotparser.RobotFileParser]: A robots.txt parser, or None if the robots.txt can't be fetched.
+    """
+    with _robots_parsers_lock:
+        # Check if we already have a recent parser for this base URL
+        entry = _robots_cache.get(base_url)
+        if _is_fresh(entry):
+            # Mark as most recently used
+            _robots_cache.move_to_end(base_url)
+            return entry.parser
+        
+        fetch_lock = _robots_fetch_locks.setdefault(base_url, Lock())
+    
+    # Fetch without holding the cache lock, so other sites are not kept waiting
+    with fetch_lock:
+        with _robots_parsers_lock:
+            # Another thread may have fetched it while we waited for the lock
+            entry = _robots_cache.get(base_url)
+            if _is_fresh(entry):
+                return entry.parser
+        
+        # A failed fetch has nothing to revalidate
+        if entry is not None and entry.parser is None:
+            entry = None
+        
+        try:
+            # Fetch robots.txt, or revalidate the expired copy
+            entry = _fetch_robots(base_url, entry)
+        except Exception as e:
+            logger.error("Error reading robots.txt for %s: %s", base_url, e)
+            # Remember the failure, so the site is not retried on every call
+            entry = _RobotsEntry(None, time.time(), None, None, _robots_failures_cache_ttl)
+        
+        with _robots_parsers_lock:
+            # Cache the parser, evicting the least recently used ones
+            _robots_cache[base_url] = entry
+            _robots_cache.move_to_end(base_url)
+            while len(_robots_cache) > _robots_parsers_max_cache_size:
+                _robots_cache.popitem(last=False)
+            
+            _robots_fetch_locks.pop(base_url, None)
+        
+        return entry.parser
 
 class RobotsTxtChecker:
     """
@@ -42,16 +198,8 @@ class RobotsTxtChecker:
         Returns:
             bool: True if the URL can be fetched, False otherwise.
         """
-        # Parse the URL
-        parsed_url = urllib.parse.urlparse(url)
-        
-        # Get the base URL (scheme + netloc)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        
-        # Get the path
-        path = parsed_url.path
-        if not path:
-            path = "/"
+        # Get the base URL (scheme + netloc) and the path
+        base_url, path = _split_url(url)
         
         # Check if the URL can be fetched
         try:
@@ -62,7 +210,7 @@ class RobotsTxtChecker:
                 # If we can't get the robots.txt, assume we can fetch
                 return True
         except Exception as e:
-            logger.error(f"Error checking robots.txt for {url}: {str(e)}")
+            logger.error("Error checking robots.txt for %s: %s", url, e)
             # If there's an error, assume we can fetch
             return True
     
@@ -76,63 +224,44 @@ class RobotsTxtChecker:
         Returns:
             Optional[urllib.robotparser.RobotFileParser]: A robots.txt parser, or None if the robots.txt can't be fetched.
         """
-        global _robots_parsers, _robots_parsers_last_used
-        
-        with _robots_parsers_lock:
-            # Clean up old parsers
-            self._cleanup_old_parsers()
-            
-            # Check if we already have a parser for this base URL
-            if base_url in _robots_parsers:
-                # Update last used time
-                _robots_parsers_last_used[base_url] = time.time()
-                return _robots_parsers[base_url]
-            
-            # Create a new parser
-            parser = urllib.robotparser.RobotFileParser()
-            parser.set_url(f"{base_url}/robots.txt")
-            
-            try:
-                parser.read()
-                
-                # Cache the parser
-                _robots_parsers[base_url] = parser
-                _robots_parsers_last_used[base_url] = time.time()
-                
-                return parser
-            except Exception as e:
-                logger.error(f"Error reading robots.txt for {base_url}: {str(e)}")
-                return None
-    
-    def _cleanup_old_parsers(self) -> None:
-        """
-        Clean up old robots.txt parsers from the cache.
+        return _load_parser(base_url)
+    
+    def prefetch(self, urls: Iterable[str], max_workers: int = 32,
+                 timeout: Optional[float] = None) -> None:
         """
-        global _robots_parsers, _robots_parsers_last_used, _robots_parsers_max_cache_size, _robots_parsers_cache_ttl
+        Fetch the robots.txt files of the sites of many URLs in parallel.
         
-        # Check if we need to clean up
-        if len(_robots_parsers) <= _robots_parsers_max_cache_size:
-            return
+        Later checks for these URLs are answered from the cache. Sites whose
+        robots.txt is already cached are skipped.
         
-        # Get current time
-        current_time = time.time()
+        Args:
+            urls (Iterable[str]): The URLs that will be checked.
+            max_workers (int): Maximum number of robots.txt files fetched at once.
+            timeout (float, optional): Maximum time in seconds to wait for all fetches.
+                                       Sites not fetched by then are fetched by the
+                                       first check that needs them. Default is no limit.
+        """
+        base_urls = {_split_url(url)[0] for url in urls}
+        with _robots_parsers_lock:
+            base_urls = [base_url for base_url in base_urls if not _is_fresh(_robots_cache.get(base_url))]
         
-        # Remove old parsers
-        for base_url in list(_robots_parsers.keys()):
-            last_used = _robots_parsers_last_used.get(base_url, 0)
-            if current_time - last_used > _robots_parsers_cache_ttl:
-                del _robots_parsers[base_url]
-                del _robots_parsers_last_used[base_url]
+        if not base_urls:
+            return
         
-        # If we still have too many parsers, remove the oldest ones
-        if len(_robots_parsers) > _robots_parsers_max_cache_size:
-            # Sort by last used time
-            sorted_urls = sorted(_robots_parsers_last_used.items(), key=lambda x: x[1])
-            
-            # Remove the oldest ones
-            for base_url, _ in sorted_urls[:len(_robots_parsers) - _robots_parsers_max_cache_size]:
-                del _robots_parsers[base_url]
-                del _robots_parsers_last_used[base_url]
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(base_urls))),
+                                      thread_name_prefix="robots")
+        try:
+            futures = [executor.submit(_load_parser, base_url) for base_url in base_urls]
+            try:
+                for _ in as_completed(futures, timeout=timeout):
+                    pass
+            except TimeoutError:
+                pending = sum(1 for future in futures if not future.done())
+                logger.warning("Prefetching robots.txt timed out after %s seconds, %s sites not fetched",
+                               timeout, pending)
+        finally:
+            # Do not wait for fetches still running after a timeout
+            executor.shutdown(wait=False, cancel_futures=True)
 
 def get_crawl_delay(url: str, user_agent: str) -> Optional[float]:
     """
@@ -145,22 +274,8 @@ def get_crawl_delay(url: str, user_agent: str) -> Optional[float]:
     Returns:
         Optional[float]: The crawl delay in seconds, or None if not specified.
     """
-    # Parse the URL
-    parsed_url = urllib.parse.urlparse(url)
-    
-    # Get the base URL (scheme + netloc)
-    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-    
-    # Create a parser
-    parser = urllib.robotparser.RobotFileParser()
-    parser.set_url(f"{base_url}/robots.txt")
-    
-    try:
-        parser.read()
-        return parser.crawl_delay(user_agent)
-    except Exception as e:
-        logger.error(f"Error reading robots.txt for {base_url}: {str(e)}")
-        return None
+    parser = _load_parser(_split_url(url)[0])
+    return parser.crawl_delay(user_agent) if parser else None
 
 def get_request_rate(url: str, user_agent: str) -> Optional[tuple]:
     """
@@ -173,22 +288,8 @@ def get_request_rate(url: str, user_agent: str) -> Optional[tuple]:
     Returns:
         Optional[tuple]: A tuple of (requests, seconds), or None if not specified.
     """
-    # Parse the URL
-    parsed_url = urllib.parse.urlparse(url)
-    
-    # Get the base URL (scheme + netloc)
-    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-    
-    # Create a parser
-    parser = urllib.robotparser.RobotFileParser()
-    parser.set_url(f"{base_url}/robots.txt")
-    
-    try:
-        parser.read()
-        return parser.request_rate(user_agent)
-    except Exception as e:
-        logger.error(f"Error reading robots.txt for {base_url}: {str(e)}")
-        return None
+    parser = _load_parser(_split_url(url)[0])
+    return parser.request_rate(user_agent) if parser else None
 
 def get_sitemaps(url: str) -> list:
     """
@@ -200,19 +301,5 @@ def get_sitemaps(url: str) -> list:
     Returns:
         list: A list of sitemap URLs, or an empty list if none are specified.
     """
-    # Parse the URL
-    parsed_url = urllib.parse.urlparse(url)
-    
-    # Get the base URL (scheme + netloc)
-    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-    
-    # Create a parser
-    parser = urllib.robotparser.RobotFileParser()
-    parser.set_url(f"{base_url}/robots.txt")
-    
-    try:
-        parser.read()
-        return parser.site_maps()
-    except Exception as e:
-        logger.error(f"Error reading robots.txt for {base_url}: {str(e)}")
-        return []
\ No newline at end of file
+    parser = _load_parser(_split_url(url)[0])
+    return (parser.site_maps() or []) if parser else []
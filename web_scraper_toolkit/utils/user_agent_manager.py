@@ -3,11 +3,14 @@ User agent management for the Web Scraper Toolkit.
 """
 
 import logging
-import random
+import re
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
+from threading import Lock
 from fake_useragent import UserAgent
 
+from . import _rng
+
 logger = logging.getLogger(__name__)
 
 # Default user agents
@@ -32,11 +35,45 @@ DEFAULT_USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 OPR/77.0.4054.254",
 ]
 
-# Cache for user agents
-_user_agents_cache: Optional[List[str]] = None
+# Patterns telling which browser a user agent belongs to; Edge and Opera user
+# agents also mention Chrome, and Chrome user agents also mention Safari
+_BROWSER_PATTERNS = {
+    "chrome": re.compile(r"^(?!.*(?:edg|opr)).*chrome", re.IGNORECASE),
+    "firefox": re.compile(r"firefox", re.IGNORECASE),
+    "safari": re.compile(r"^(?!.*chrome).*safari", re.IGNORECASE),
+    "edge": re.compile(r"edg", re.IGNORECASE),
+    "opera": re.compile(r"opr", re.IGNORECASE),
+}
+
+def _group_by_browser(user_agents: List[str]) -> Dict[str, List[str]]:
+    """
+    Group user agents by the browser they belong to, in a single pass.
+    
+    Args:
+        user_agents (List[str]): The user agents.
+    
+    Returns:
+        Dict[str, List[str]]: The user agents of each browser in _BROWSER_PATTERNS,
+                              plus all of them under "all".
+    """
+    groups: Dict[str, List[str]] = {browser: [] for browser in _BROWSER_PATTERNS}
+    patterns = tuple((pattern.search, groups[browser]) for browser, pattern in _BROWSER_PATTERNS.items())
+    for agent in user_agents:
+        for search, group in patterns:
+            if search(agent):
+                group.append(agent)
+    
+    groups["all"] = list(user_agents)
+    return groups
+
+_DEFAULT_USER_AGENTS_BY_BROWSER = _group_by_browser(DEFAULT_USER_AGENTS)
+
+# Cache for user agents, grouped by browser when loaded
+_user_agents_cache: Optional[Dict[str, List[str]]] = None
+_user_agents_lock = Lock()
 _fake_ua: Optional[UserAgent] = None
 
-def _load_user_agents(file_path: str) -> List[str]:
+def _load_user_agents(file_path: str) -> Dict[str, List[str]]:
     """
     Load user agents from a file.
     
@@ -44,36 +81,44 @@ def _load_user_agents(file_path: str) -> List[str]:
         file_path (str): Path to the file containing user agents.
     
     Returns:
-        List[str]: List of user agents.
+        Dict[str, List[str]]: The user agents of each browser, and all of them under "all".
     """
     global _user_agents_cache
     
-    # Return cached user agents if available
-    if _user_agents_cache is not None:
-        return _user_agents_cache
-    
-    # Check if file exists
-    if not os.path.exists(file_path):
-        logger.warning(f"User agent file not found: {file_path}")
-        return DEFAULT_USER_AGENTS
+    # Return cached user agents if available, without locking once loaded
+    user_agents_cache = _user_agents_cache
+    if user_agents_cache is not None:
+        return user_agents_cache
     
-    # Load user agents from file
-    try:
-        with open(file_path, "r") as f:
-            user_agents = [line.strip() for line in f if line.strip()]
+    with _user_agents_lock:
+        # Another thread may have loaded them while we waited for the lock
+        if _user_agents_cache is not None:
+            return _user_agents_cache
         
-        if not user_agents:
-            logger.warning(f"No user agents found in {file_path}")
-            return DEFAULT_USER_AGENTS
+        # Check if file exists
+        if not os.path.exists(file_path):
+            logger.warning("User agent file not found: %s", file_path)
+            return _DEFAULT_USER_AGENTS_BY_BROWSER
         
-        # Cache user agents
-        _user_agents_cache = user_agents
-        
-        logger.info(f"Loaded {len(user_agents)} user agents from {file_path}")
-        return user_agents
-    except Exception as e:
-        logger.error(f"Error loading user agents from {file_path}: {str(e)}")
-        return DEFAULT_USER_AGENTS
+        # Load user agents from file
+        try:
+            # Read the whole file at once rather than line by line
+            with open(file_path, "r") as f:
+                lines = f.read().splitlines()
+            user_agents = [line for line in map(str.strip, lines) if line]
+            
+            if not user_agents:
+                logger.warning("No user agents found in %s", file_path)
+                return _DEFAULT_USER_AGENTS_BY_BROWSER
+            
+            # Cache user agents
+            _user_agents_cache = _group_by_browser(user_agents)
+            
+            logger.info("Loaded %s user agents from %s", len(user_agents), file_path)
+            return _user_agents_cache
+        except Exception as e:
+            logger.error("Error loading user agents from %s: %s", file_path, e)
+            return _DEFAULT_USER_AGENTS_BY_BROWSER
 
 def get_random_user_agent(file_path: Optional[str] = None) -> str:
     """
@@ -94,14 +139,14 @@ def get_random_user_agent(file_path: Optional[str] = None) -> str:
                 _fake_ua = UserAgent()
             return _fake_ua.random
         except Exception as e:
-            logger.warning(f"Error using fake-useragent: {str(e)}")
-            return random.choice(DEFAULT_USER_AGENTS)
+            logger.warning("Error using fake-useragent: %s", e)
+            return _rng().choice(DEFAULT_USER_AGENTS)
     
     # Load user agents from file
     user_agents = _load_user_agents(file_path)
     
     # Return a random user agent
-    return random.choice(user_agents)
+    return _rng().choice(user_agents["all"])
 
 def get_specific_browser_user_agent(browser: str, file_path: Optional[str] = None) -> str:
     """
@@ -136,45 +181,25 @@ def get_specific_browser_user_agent(browser: str, file_path: Optional[str] = Non
             else:
                 return _fake_ua.random
         except Exception as e:
-            logger.warning(f"Error using fake-useragent: {str(e)}")
+            logger.warning("Error using fake-useragent: %s", e)
     
     # Load user agents from file
     user_agents = _load_user_agents(file_path)
     
-    # Filter user agents by browser
+    # Get the user agents of the browser ("all" is not a browser)
     browser = browser.lower()
-    filtered_agents = []
-    
-    for agent in user_agents:
-        agent_lower = agent.lower()
-        if browser == "chrome" and "chrome" in agent_lower and "edg" not in agent_lower and "opr" not in agent_lower:
-            filtered_agents.append(agent)
-        elif browser == "firefox" and "firefox" in agent_lower:
-            filtered_agents.append(agent)
-        elif browser == "safari" and "safari" in agent_lower and "chrome" not in agent_lower:
-            filtered_agents.append(agent)
-        elif browser == "edge" and "edg" in agent_lower:
-            filtered_agents.append(agent)
-        elif browser == "opera" and "opr" in agent_lower:
-            filtered_agents.append(agent)
+    if browser == "all":
+        return _rng().choice(DEFAULT_USER_AGENTS)
+    filtered_agents = user_agents.get(browser)
     
     # Return a random user agent for the specified browser
     if filtered_agents:
-        return random.choice(filtered_agents)
+        return _rng().choice(filtered_agents)
     else:
         # Fallback to default user agents
-        for agent in DEFAULT_USER_AGENTS:
-            agent_lower = agent.lower()
-            if browser == "chrome" and "chrome" in agent_lower and "edg" not in agent_lower and "opr" not in agent_lower:
-                return agent
-            elif browser == "firefox" and "firefox" in agent_lower:
-                return agent
-            elif browser == "safari" and "safari" in agent_lower and "chrome" not in agent_lower:
-                return agent
-            elif browser == "edge" and "edg" in agent_lower:
-                return agent
-            elif browser == "opera" and "opr" in agent_lower:
-                return agent
+        default_agents = _DEFAULT_USER_AGENTS_BY_BROWSER.get(browser)
+        if default_agents:
+            return default_agents[0]
         
         # If no matching user agent found, return a random one
-        return random.choice(DEFAULT_USER_AGENTS)
\ No newline at end of file
+        return _rng().choice(DEFAULT_USER_AGENTS)
\ No newline at end of file